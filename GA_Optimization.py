@@ -1,13 +1,668 @@
 import time
 import json
+import hashlib
+import heapq
 import networkx as nx
+import numpy as np
 import os
 import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from experiment_configuration import ExperimentConfiguration
-from GA_community import GACommunity  
+from GA_community import GACommunity
+import my_time
+from my_time import instrumented
+
+# Nilai hop untuk pasangan (gateway, node) yang tidak terhubung
+UNREACHABLE_HOP = 100
+# Latency (ms) untuk pasangan (gateway, service) -> node yang tidak terhubung (objective "latency")
+UNREACHABLE_LATENCY = 1e5
+
+
+class Placement:
+    """
+    Placement service -> node dalam bentuk ringkas: array int32 berisi index node per service.
+    Matrix service x node hanya dibangun jika diminta (to_dense / to_sparse); iterasi atau
+    indexing per service tetap menghasilkan baris one-hot seperti placement matrix lama.
+    """
+
+    __slots__ = ("nodes", "node_ids")
+
+    def __init__(self, nodes, node_ids):
+        self.nodes = np.asarray(nodes, dtype=np.int32)
+        self.node_ids = node_ids
+
+    @classmethod
+    def from_matrix(cls, matrix, node_ids):
+        nodes = np.full(len(matrix), -1, dtype=np.int32)
+        for sid, row in enumerate(matrix):
+            cols = np.flatnonzero(np.asarray(row))
+            if len(cols):
+                nodes[sid] = cols[0]
+        return cls(nodes, node_ids)
+
+    def node_list(self):
+        return [self.node_ids[idx] if idx >= 0 else None for idx in self.nodes.tolist()]
+
+    def to_dense(self):
+        matrix = np.zeros((len(self.nodes), len(self.node_ids)), dtype=np.int8)
+        placed = np.flatnonzero(self.nodes >= 0)
+        matrix[placed, self.nodes[placed]] = 1
+        return matrix
+
+    def to_sparse(self):
+        from scipy.sparse import csr_matrix
+        placed = np.flatnonzero(self.nodes >= 0)
+        return csr_matrix(
+            (np.ones(len(placed), dtype=np.int8), (placed, self.nodes[placed])),
+            shape=(len(self.nodes), len(self.node_ids)),
+        )
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, sid):
+        row = [0] * len(self.node_ids)
+        if self.nodes[sid] >= 0:
+            row[self.nodes[sid]] = 1
+        return row
+
+    def __iter__(self):
+        for sid in range(len(self.nodes)):
+            yield self[sid]
+
+
+class PlacementState:
+    """Kromosom beserta potongan fitness yang di-cache untuk evaluasi inkremental."""
+
+    __slots__ = ("chrom", "usage", "svc_hop", "total_hop", "penalty", "n_cloud")
+
+    def __init__(self, chrom, usage, svc_hop, total_hop, penalty, n_cloud):
+        self.chrom = chrom
+        self.usage = usage
+        self.svc_hop = svc_hop
+        self.total_hop = total_hop
+        self.penalty = penalty
+        self.n_cloud = n_cloud
+
+    @property
+    def fitness(self):
+        return -(self.total_hop + self.penalty + self.n_cloud * 0.1)
+
+
+class PlacementProblem:
+    """
+    Bentuk array dari fungsi objektif GA placement: resource service, kapasitas node,
+    daftar request dan tabel hop di-ekstrak sekali, lalu satu populasi dinilai sekaligus.
+    Skor sama dengan fitness per kromosom: -(total_hop + 10000 * overflow + 0.1 * service_di_cloud).
+    Dengan tabel latency (baris per pasangan gateway-service), total_hop berisi total latency (ms).
+    """
+
+    # Batas jumlah elemen array sementara per blok evaluasi
+    EVAL_BLOCK_ELEMENTS = 1 << 22
+
+    def __init__(self, node_ids, cloud_id, service_resources, node_resources, num_services,
+                 user_requests, distance_table):
+        self.node_ids = list(node_ids)
+        self.num_nodes = len(self.node_ids)
+        self.num_services = num_services
+        self.cloud_id = cloud_id
+        try:
+            self.cloud_idx = self.node_ids.index(cloud_id)
+        except ValueError:
+            raise RuntimeError("Cloud node not found in node_ids after explicit add.")
+
+        for sid in range(num_services):
+            if sid not in service_resources:
+                print(f"[ERROR] sid {sid} tidak ada di service_resources, diisi 0")
+        self.service_res = np.array([service_resources.get(sid, 0) for sid in range(num_services)], dtype=float)
+        self.node_cap = np.array([node_resources[nid] for nid in self.node_ids], dtype=float)
+
+        if "pairs" in distance_table:
+            # Tabel latency: satu baris per pasangan (gateway, service)
+            pair_row = {pair: row for row, pair in enumerate(distance_table["pairs"])}
+            latency = distance_table["latency"]
+            self.cost = np.where(np.isinf(latency), UNREACHABLE_LATENCY, latency)
+            self.req_rows = np.array([pair_row[tuple(req)] for req in user_requests], dtype=np.intp)
+        else:
+            gateway_row = {gw: row for row, gw in enumerate(distance_table["gateways"])}
+            hops = distance_table["hops"]
+            self.cost = np.where(hops < 0, UNREACHABLE_HOP, hops)
+            self.req_rows = np.array([gateway_row[iot_id] for iot_id, _ in user_requests], dtype=np.intp)
+        self.req_services = np.array([service_id for _, service_id in user_requests], dtype=np.intp)
+        self._index_requests()
+        self._service_cost = None
+        self._candidates = None
+
+    def _index_requests(self):
+        # Request dikelompokkan per service (format CSR) untuk update delta saat mutasi
+        order = np.argsort(self.req_services, kind="stable")
+        self.svc_req_rows = self.req_rows[order]
+        self.svc_req_ptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(self.req_services, minlength=self.num_services)))
+        ).astype(np.intp)
+
+    def subproblem(self, services, node_columns):
+        """
+        Problem lokal berisi sebagian service (index global) dan sebagian kolom node;
+        cloud selalu disertakan. Service dan node di-index ulang mulai dari 0.
+        """
+        services = np.asarray(services, dtype=np.intp)
+        node_columns = np.asarray(node_columns, dtype=np.intp)
+        if self.cloud_idx not in node_columns:
+            node_columns = np.append(node_columns, self.cloud_idx)
+        sub = PlacementProblem.__new__(PlacementProblem)
+        sub.node_ids = [self.node_ids[col] for col in node_columns.tolist()]
+        sub.num_nodes = len(node_columns)
+        sub.num_services = len(services)
+        sub.cloud_id = self.cloud_id
+        sub.cloud_idx = sub.node_ids.index(self.cloud_id)
+        sub.service_res = self.service_res[services]
+        sub.node_cap = self.node_cap[node_columns]
+        sub.cost = self.cost[:, node_columns]
+        local_sid = np.full(self.num_services, -1, dtype=np.intp)
+        local_sid[services] = np.arange(len(services))
+        keep = local_sid[self.req_services] >= 0
+        sub.req_rows = self.req_rows[keep]
+        sub.req_services = local_sid[self.req_services[keep]]
+        sub._index_requests()
+        sub._service_cost = None
+        sub._candidates = None
+        return sub
+
+    def service_cost(self):
+        # (num_services, num_nodes): total cost seluruh request service jika ditempatkan di node
+        if self._service_cost is None:
+            svc_cost = np.zeros((self.num_services, self.num_nodes))
+            for sid in range(self.num_services):
+                rows = self.svc_req_rows[self.svc_req_ptr[sid]:self.svc_req_ptr[sid + 1]]
+                if len(rows):
+                    svc_cost[sid] = self.cost[rows].sum(axis=0)
+            self._service_cost = svc_cost
+        return self._service_cost
+
+    def candidate_order(self):
+        """
+        Per service: index node diurutkan dari total cost seluruh request service tersebut
+        (hop atau latency), terkecil dulu; cloud selalu di urutan terakhir. Dibangun sekali.
+        """
+        if self._candidates is None:
+            svc_cost = self.service_cost().copy()
+            svc_cost[:, self.cloud_idx] = np.inf
+            self._candidates = np.argsort(svc_cost, axis=1, kind="stable")
+        return self._candidates
+
+    def _repair_moves(self, chrom, usage):
+        # Pindahkan service dari node over-capacity (terbesar dulu) ke kandidat terdekat yang
+        # sisa kapasitasnya cukup, cloud jika tidak ada. chrom diubah in place.
+        residual = self.node_cap - usage
+        over = np.flatnonzero(residual < 0)
+        moves = []
+        if not len(over):
+            return moves
+        candidates = self.candidate_order()
+        for node in over.tolist():
+            if node == self.cloud_idx:
+                continue
+            services = np.flatnonzero(chrom == node)
+            for sid in services[np.argsort(-self.service_res[services], kind="stable")].tolist():
+                if residual[node] >= 0:
+                    break
+                res = self.service_res[sid]
+                if res <= 0:
+                    continue
+                order = candidates[sid]
+                free = order[residual[order] >= res]
+                target = int(free[0]) if len(free) else self.cloud_idx
+                chrom[sid] = target
+                residual[node] += res
+                residual[target] -= res
+                moves.append((sid, target))
+        return moves
+
+    def repair(self, chrom):
+        # Repair kapasitas in place; return jumlah service yang dipindahkan
+        chrom = np.asarray(chrom)
+        usage = np.bincount(chrom, weights=self.service_res, minlength=self.num_nodes)
+        return len(self._repair_moves(chrom, usage))
+
+    def repair_population(self, population):
+        # Return jumlah individu yang diperbaiki
+        return sum(1 for chrom in population if self.repair(chrom))
+
+    def infeasible_count(self, population):
+        # Jumlah individu dengan overflow kapasitas (untuk instrumentasi)
+        pop = np.asarray(population, dtype=np.intp)
+        size, num_nodes = len(pop), self.num_nodes
+        flat = (pop + (np.arange(size) * num_nodes)[:, None]).ravel()
+        weights = np.broadcast_to(self.service_res, pop.shape).ravel()
+        usage = np.bincount(flat, weights=weights, minlength=size * num_nodes).reshape(size, num_nodes)
+        return int((usage > self.node_cap).any(axis=1).sum())
+
+    def repair_state(self, state):
+        # Sama dengan repair(), tetapi cache fitness PlacementState ikut di-update per perpindahan
+        for sid, node in self._repair_moves(state.chrom.copy(), state.usage):
+            self.mutate_state(state, sid, node)
+        return state
+
+    def placement(self, chrom):
+        return Placement(chrom, self.node_ids)
+
+    def fitness(self, chrom):
+        return float(self.evaluate(np.asarray(chrom)[None, :])[0])
+
+    def evaluate(self, population):
+        pop = np.asarray(population, dtype=np.intp)
+        if pop.size and pop.max() >= self.num_nodes:
+            raise ValueError(f"Chromosome index {pop.max()} out of range for node_ids (len={self.num_nodes})")
+        block = max(1, self.EVAL_BLOCK_ELEMENTS // max(1, self.num_nodes, len(self.req_rows)))
+        fits = np.empty(len(pop), dtype=float)
+        for start in range(0, len(pop), block):
+            fits[start:start + block] = self._evaluate_block(pop[start:start + block])
+        return fits
+
+    def _evaluate_block(self, pop):
+        size, num_nodes = len(pop), self.num_nodes
+        # Pemakaian resource per node untuk seluruh populasi dengan satu bincount
+        flat = (pop + (np.arange(size) * num_nodes)[:, None]).ravel()
+        weights = np.broadcast_to(self.service_res, pop.shape).ravel()
+        usage = np.bincount(flat, weights=weights, minlength=size * num_nodes).reshape(size, num_nodes)
+        penalty = 10000 * np.clip(usage - self.node_cap, 0, None).sum(axis=1)
+        total_hop = self.cost[self.req_rows, pop[:, self.req_services]].sum(axis=1)
+        fog_penalty = (pop == self.cloud_idx).sum(axis=1) * 0.1
+        return -(total_hop + penalty + fog_penalty)
+
+    def objectives(self, population):
+        """
+        Objektif NSGA-II per individu (semua diminimalkan), tanpa bobot:
+        kolom 0 total cost request (hop atau latency), kolom 1 ketidakseimbangan resource
+        (std utilisasi node fog), kolom 2 jumlah service di cloud.
+        Output: (objectives (P, 3), violation (P,)) dengan violation = total overflow kapasitas.
+        """
+        pop = np.asarray(population, dtype=np.intp)
+        block = max(1, self.EVAL_BLOCK_ELEMENTS // max(1, self.num_nodes, len(self.req_rows)))
+        objs = np.empty((len(pop), 3))
+        violation = np.empty(len(pop))
+        fog = np.arange(self.num_nodes) != self.cloud_idx
+        for start in range(0, len(pop), block):
+            part = pop[start:start + block]
+            size, num_nodes = len(part), self.num_nodes
+            flat = (part + (np.arange(size) * num_nodes)[:, None]).ravel()
+            weights = np.broadcast_to(self.service_res, part.shape).ravel()
+            usage = np.bincount(flat, weights=weights, minlength=size * num_nodes).reshape(size, num_nodes)
+            util = usage[:, fog] / np.where(self.node_cap[fog] > 0, self.node_cap[fog], 1)
+            objs[start:start + block, 0] = self.cost[self.req_rows, part[:, self.req_services]].sum(axis=1)
+            objs[start:start + block, 1] = util.std(axis=1)
+            objs[start:start + block, 2] = (part == self.cloud_idx).sum(axis=1)
+            violation[start:start + block] = np.clip(usage - self.node_cap, 0, None).sum(axis=1)
+        return objs, violation
+
+    def _overflow(self, usage, nodes):
+        return 10000 * np.clip(usage[nodes] - self.node_cap[nodes], 0, None).sum()
+
+    def state(self, chrom):
+        chrom = np.array(chrom, dtype=np.intp)
+        usage = np.bincount(chrom, weights=self.service_res, minlength=self.num_nodes)
+        svc_hop = np.bincount(self.req_services, weights=self.cost[self.req_rows, chrom[self.req_services]],
+                              minlength=self.num_services)
+        return PlacementState(
+            chrom,
+            usage,
+            svc_hop,
+            svc_hop.sum(),
+            10000 * np.clip(usage - self.node_cap, 0, None).sum(),
+            int((chrom == self.cloud_idx).sum()),
+        )
+
+    def crossover_state(self, s1, s2, point):
+        # Mulai dari parent yang menyumbang gen terbanyak, lalu tukar potongan parent lainnya
+        if point >= self.num_services - point:
+            base, other, part = s1, s2, slice(point, None)
+        else:
+            base, other, part = s2, s1, slice(0, point)
+        chrom = base.chrom.copy()
+        chrom[part] = other.chrom[part]
+        svc_hop = base.svc_hop.copy()
+        svc_hop[part] = other.svc_hop[part]
+        total_hop = base.total_hop - base.svc_hop[part].sum() + other.svc_hop[part].sum()
+
+        old_nodes, new_nodes = base.chrom[part], other.chrom[part]
+        changed = np.nonzero(old_nodes != new_nodes)[0]
+        usage, penalty, n_cloud = base.usage, base.penalty, base.n_cloud
+        if len(changed):
+            old_nodes, new_nodes = old_nodes[changed], new_nodes[changed]
+            res = self.service_res[part][changed]
+            touched = np.unique(np.concatenate((old_nodes, new_nodes)))
+            penalty -= self._overflow(usage, touched)
+            usage = usage.copy()
+            np.subtract.at(usage, old_nodes, res)
+            np.add.at(usage, new_nodes, res)
+            penalty += self._overflow(usage, touched)
+            n_cloud += int((new_nodes == self.cloud_idx).sum()) - int((old_nodes == self.cloud_idx).sum())
+        else:
+            usage = usage.copy()
+        return PlacementState(chrom, usage, svc_hop, total_hop, penalty, n_cloud)
+
+    def mutate_state(self, state, sid, node):
+        old = state.chrom[sid]
+        if old == node:
+            return state
+        touched = np.array([old, node])
+        state.penalty -= self._overflow(state.usage, touched)
+        state.usage[old] -= self.service_res[sid]
+        state.usage[node] += self.service_res[sid]
+        state.penalty += self._overflow(state.usage, touched)
+        # Hanya request milik service sid yang dihitung ulang
+        rows = self.svc_req_rows[self.svc_req_ptr[sid]:self.svc_req_ptr[sid + 1]]
+        hop = self.cost[rows, node].sum()
+        state.total_hop += hop - state.svc_hop[sid]
+        state.svc_hop[sid] = hop
+        state.n_cloud += int(node == self.cloud_idx) - int(old == self.cloud_idx)
+        state.chrom[sid] = node
+        return state
+
+
+def random_population(pop_size, num_services, num_nodes, rng=random):
+    # Populasi disimpan sebagai array (pop_size, number_of_services), juga saat pop_size = 0
+    return np.array([[rng.randint(0, num_nodes-1) for _ in range(num_services)] for _ in range(pop_size)],
+                    dtype=np.int32).reshape(pop_size, num_services)
+
+
+def greedy_population(problem, size, rng=random):
+    """
+    Seeding greedy: service diurutkan dari volume request terbesar, lalu masing-masing ditempatkan
+    di node dengan total cost request terkecil yang kapasitasnya masih cukup (cloud jika penuh).
+    Tie di kedua urutan dipecah acak sehingga tiap individu berbeda.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    volume = np.diff(problem.svc_req_ptr)
+    svc_cost = problem.service_cost().copy()
+    svc_cost[:, problem.cloud_idx] = np.inf
+    population = np.empty((size, problem.num_services), dtype=np.int32)
+    for k in range(size):
+        residual = problem.node_cap.copy()
+        chrom = population[k]
+        for sid in np.lexsort((gen.random(problem.num_services), -volume)).tolist():
+            res = problem.service_res[sid]
+            order = np.lexsort((gen.random(problem.num_nodes), svc_cost[sid]))
+            # Cloud (urutan terakhir karena cost inf) selalu muat
+            chrom[sid] = order[residual[order] >= res][0]
+            residual[chrom[sid]] -= res
+    return population
+
+
+def ffd_population(problem, size, centrality, rng=random):
+    """
+    Seeding first-fit decreasing: service terbesar dulu, masing-masing ke node pertama (urut
+    centrality menurun) yang kapasitasnya cukup, cloud jika tidak ada. Tie dipecah acak.
+    centrality: array per kolom node problem.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    fog = np.flatnonzero(np.arange(problem.num_nodes) != problem.cloud_idx)
+    centrality = np.asarray(centrality, dtype=float)[fog]
+    population = np.empty((size, problem.num_services), dtype=np.int32)
+    for k in range(size):
+        residual = problem.node_cap.copy()
+        nodes = fog[np.lexsort((gen.random(len(fog)), -centrality))]
+        chrom = population[k]
+        for sid in np.lexsort((gen.random(problem.num_services), -problem.service_res)).tolist():
+            res = problem.service_res[sid]
+            free = np.flatnonzero(residual[nodes] >= res)
+            chrom[sid] = nodes[free[0]] if len(free) else problem.cloud_idx
+            residual[chrom[sid]] -= res
+    return population
+
+
+def non_dominated_sort(objectives, violation=None, block_elements=1 << 22):
+    """
+    Rank front Pareto (0 = non-dominated) dengan constraint domination: violation lebih kecil
+    selalu mendominasi; violation sama dibandingkan secara Pareto (semua objektif diminimalkan).
+    Matriks dominasi dibangun per blok baris, front dikupas dengan operasi array.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    size = len(objectives)
+    violation = np.zeros(size) if violation is None else np.asarray(violation, dtype=float)
+    dominates = np.empty((size, size), dtype=bool)
+    block = max(1, block_elements // max(1, size))
+    for start in range(0, size, block):
+        # Per objektif dengan array 2-D boolean; tanpa array sementara 3-D
+        va = violation[start:start + block, None]
+        no_worse = va == violation[None, :]
+        better = np.zeros_like(no_worse)
+        for k in range(objectives.shape[1]):
+            a = objectives[start:start + block, k, None]
+            b = objectives[None, :, k]
+            no_worse &= a <= b
+            better |= a < b
+        dominates[start:start + block] = (va < violation[None, :]) | (no_worse & better)
+
+    ranks = np.full(size, -1, dtype=np.intp)
+    dominated_by = dominates.sum(axis=0)
+    front = np.flatnonzero(dominated_by == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        dominated_by = dominated_by - dominates[front].sum(axis=0)
+        dominated_by[ranks >= 0] = -1
+        front = np.flatnonzero(dominated_by == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(objectives, ranks):
+    """
+    Crowding distance NSGA-II untuk semua front sekaligus: per objektif, individu diurutkan
+    per (rank, nilai) dan jarak tetangga dinormalisasi rentang front; ujung front = inf.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    size = len(objectives)
+    distance = np.zeros(size)
+    if size == 0:
+        return distance
+    for m in range(objectives.shape[1]):
+        order = np.lexsort((objectives[:, m], ranks))
+        r, v = ranks[order], objectives[order, m]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+        front_id = np.cumsum(first) - 1
+        span = (v[last] - v[first])[front_id]
+        gap = np.zeros(size)
+        gap[1:-1] = v[2:] - v[:-2]
+        contrib = np.divide(gap, span, out=np.zeros(size), where=span > 0)
+        contrib[first | last] = np.inf
+        distance[order] += contrib
+    return distance
+
+
+def crowded_fitness(ranks, distance):
+    # Skor skalar yang urutannya sama dengan crowded comparison (rank kecil, lalu crowding besar),
+    # sehingga tournament()/breed() bisa dipakai ulang untuk NSGA-II
+    order = np.lexsort((-distance, ranks))
+    fits = np.empty(len(order))
+    fits[order] = -np.arange(len(order), dtype=float)
+    return fits
+
+
+def tournament(fits, rng=random):
+    idx1, idx2 = rng.sample(range(len(fits)), 2)
+    return idx1 if fits[idx1] > fits[idx2] else idx2
+
+
+def breeding_plan(fits, num_services, num_nodes, mutation_rate, rng=random, genes=None):
+    """
+    Satu generasi: tournament selection, single-point crossover, lalu mutasi satu gen.
+    Yield (parent1, parent2, point, mutation) per anak, mutation = (gen, node) atau None.
+    genes membatasi gen yang boleh dimutasi (warm start); None berarti semua gen.
+    """
+    for _ in range(len(fits)):
+        p1 = tournament(fits, rng)
+        p2 = tournament(fits, rng)
+        point = rng.randint(1, num_services-1)
+        mutation = None
+        if rng.random() < mutation_rate:
+            if genes is None:
+                idx = rng.randint(0, num_services-1)
+            else:
+                idx = genes[rng.randint(0, len(genes)-1)]
+            mutation = (idx, rng.randint(0, num_nodes-1))
+        yield p1, p2, point, mutation
+
+
+def breed(population, fits, num_nodes, mutation_rate, rng=random, genes=None):
+    new_pop = np.empty_like(population)
+    plan = breeding_plan(fits, population.shape[1], num_nodes, mutation_rate, rng, genes)
+    for k, (p1, p2, point, mutation) in enumerate(plan):
+        new_pop[k, :point] = population[p1, :point]
+        new_pop[k, point:] = population[p2, point:]
+        if mutation is not None:
+            new_pop[k, mutation[0]] = mutation[1]
+    return new_pop
+
+
+def breed_states(problem, states, fits, mutation_rate, rng=random, genes=None):
+    # Sama dengan breed(), tetapi anak dibangun dari cache PlacementState milik parent
+    children = []
+    plan = breeding_plan(fits, problem.num_services, problem.num_nodes, mutation_rate, rng, genes)
+    for p1, p2, point, mutation in plan:
+        child = problem.crossover_state(states[p1], states[p2], point)
+        if mutation is not None:
+            problem.mutate_state(child, *mutation)
+        children.append(child)
+    return children
+
+
+class FitnessCache:
+    """Cache fitness LRU berukuran tetap, key = bytes kromosom (int16 bila jumlah node muat)."""
+
+    def __init__(self, max_size, num_nodes):
+        self.max_size = max_size
+        self.key_dtype = np.int16 if num_nodes <= np.iinfo(np.int16).max else np.int32
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def evaluate(self, population, evaluate_fn):
+        keys = [row.tobytes() for row in population.astype(self.key_dtype)]
+        fits = np.empty(len(keys), dtype=float)
+        missing = OrderedDict()
+        for i, key in enumerate(keys):
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                fits[i] = self.entries[key]
+                self.hits += 1
+            elif key in missing:
+                # Duplikat dalam batch yang sama cukup dievaluasi sekali
+                missing[key].append(i)
+                self.hits += 1
+            else:
+                missing[key] = [i]
+                self.misses += 1
+        if missing:
+            values = evaluate_fn(population[[pos[0] for pos in missing.values()]])
+            for (key, pos), value in zip(missing.items(), values):
+                fits[pos] = value
+                self.entries[key] = value
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return fits
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _path_latency(adjacency, source, num_nodes, ref_bytes):
+    """
+    Dijkstra dari source dengan bobot link PR + ref_bytes / BW.
+    Sepanjang jalur terpendek dicatat jumlah PR dan jumlah 1/BW secara terpisah, sehingga
+    latency pesan berukuran b = sum_pr + b * sum_inv_bw (tepat jika BW seragam).
+    """
+    dist = np.full(num_nodes, np.inf)
+    sum_pr = np.full(num_nodes, np.inf)
+    sum_inv_bw = np.full(num_nodes, np.inf)
+    dist[source] = sum_pr[source] = sum_inv_bw[source] = 0.0
+    heap = [(0.0, source)]
+    done = np.zeros(num_nodes, dtype=bool)
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        for v, pr, inv_bw in adjacency[u]:
+            nd = d + pr + ref_bytes * inv_bw
+            if nd < dist[v]:
+                dist[v] = nd
+                sum_pr[v] = sum_pr[u] + pr
+                sum_inv_bw[v] = sum_inv_bw[u] + inv_bw
+                heapq.heappush(heap, (nd, v))
+    return sum_pr, sum_inv_bw
+
+
+# Problem milik proses worker, dibangun sekali oleh _init_worker
+_worker_problem = None
+
+
+def _init_worker(graph, cloud_id, service_resources, node_resources, num_services, user_requests,
+                 distance_table):
+    global _worker_problem
+    _worker_problem = PlacementProblem(list(graph.nodes), cloud_id, service_resources, node_resources,
+                                       num_services, user_requests, distance_table)
+
+
+def _evaluate_chunk(chunk):
+    return _worker_problem.evaluate(chunk)
+
+
+def _run_island(population, fits, generations, mutation_rate, rng_state, repair=False):
+    rng = random.Random()
+    rng.setstate(rng_state)
+    if fits is None:
+        fits = _worker_problem.evaluate(population)
+    for _ in range(generations):
+        population = breed(population, fits, _worker_problem.num_nodes, mutation_rate, rng)
+        if repair:
+            _worker_problem.repair_population(population)
+        fits = _worker_problem.evaluate(population)
+    return population, fits, rng.getstate()
+
+
+def _solve_subproblem(problem, pop_size, generations, mutation_rate, seed, repair=False):
+    # GA sederhana untuk satu komunitas pada mode hierarchical
+    if problem.num_services == 1:
+        # Tidak ada titik crossover; semua node cukup dinilai langsung
+        candidates = np.arange(problem.num_nodes, dtype=np.int32)[:, None]
+        return candidates[int(np.argmax(problem.evaluate(candidates)))].copy()
+    rng = random.Random(seed)
+    population = random_population(pop_size, problem.num_services, problem.num_nodes, rng)
+    if repair:
+        problem.repair_population(population)
+    fits = problem.evaluate(population)
+    best = population[int(np.argmax(fits))].copy()
+    best_fit = fits.max()
+    for _ in range(generations):
+        population = breed(population, fits, problem.num_nodes, mutation_rate, rng)
+        if repair:
+            problem.repair_population(population)
+        fits = problem.evaluate(population)
+        if fits.max() > best_fit:
+            best_fit = fits.max()
+            best = population[int(np.argmax(fits))].copy()
+    return best
+
 
 class GAOptimization:
-    def __init__(self, expconf, cnf, num_communities=3):
+    def __init__(self, expconf, cnf, num_communities=3, distance_table=None, workers=None, seed=None,
+                 incremental=False, cache_size=0, objective="hops", latency_table=None, repair=False,
+                 instrumentation=None):
         self.expconf = expconf
         self.cnf = cnf
         self.G = expconf.G
@@ -15,10 +670,231 @@ class GAOptimization:
         self.fog_nodes = [n for n, d in self.G.nodes(data=True) if d.get('level', 'fog') == 'fog']
         self.all_nodes = list(self.G.nodes)
         self.cloud_id = expconf.cloud_id
+        # distance_table: None (dibangun saat dibutuhkan), path file .npz hasil
+        # save_distance_table(), atau dict hasil build_distance_table()
+        self.distance_table = distance_table
+        # workers > 1: evaluasi fitness dibagi ke ProcessPoolExecutor
+        self.workers = workers
+        # Semua keputusan acak GA diambil dari self.rng di proses utama
+        self.rng = random.Random(seed) if seed is not None else random
+        # incremental: anak mewarisi cache fitness parent (PlacementState) dan hanya gen yang berubah dihitung ulang
+        self.incremental = incremental
+        # cache_size > 0: fitness kromosom yang sama tidak dihitung ulang (lihat cache_stats())
+        self.cache_size = cache_size
+        # Mode incremental menilai anak dari state parent di proses utama, tanpa cache maupun pool
+        if incremental and cache_size:
+            raise ValueError("incremental=True tidak bisa digabung dengan cache_size > 0")
+        if incremental and workers and workers > 1:
+            raise ValueError("incremental=True tidak bisa digabung dengan workers > 1")
+        self.fitness_cache = None
+        # objective: "hops" (jumlah hop) atau "latency" (ms dari PR/BW link dan IPT node)
+        if objective not in ("hops", "latency"):
+            raise ValueError(f"objective tidak dikenal: {objective}")
+        self.objective = objective
+        # latency_table: seperti distance_table, untuk objective "latency"
+        self.latency_table = latency_table
+        # repair: individu over-capacity diperbaiki (PlacementProblem.repair) sebelum dievaluasi
+        self.repair = repair
+        # instrumentation: my_time.Instrumentation; default mengikuti environment (PLACEMENT_TRACE)
+        self.instr = instrumentation if instrumentation is not None else my_time.current()
+
+    def _ensure_cloud_node(self):
+        # Pastikan cloud node sudah ada sebelum ambil node_ids
+        if self.cloud_id not in self.G.nodes:
+            self.G.add_node(self.cloud_id)
+        # Pastikan resource cloud ada
+        if self.cloud_id not in self.expconf.node_resources:
+            self.expconf.node_resources[self.cloud_id] = 1e12
+        return list(self.G.nodes)
+
+    def _topology_key(self, node_ids):
+        h = hashlib.sha1()
+        h.update(json.dumps([str(n) for n in node_ids]).encode())
+        h.update(json.dumps(sorted([str(u), str(v)] for u, v in self.G.edges)).encode())
+        return h.hexdigest()
+
+    def _requesting_gateways(self):
+        gateways = []
+        seen = set()
+        for iot_id, _ in getattr(self.expconf, "user_requests", None) or []:
+            if iot_id not in seen:
+                seen.add(iot_id)
+                gateways.append(iot_id)
+        return gateways
+
+    def build_distance_table(self):
+        """
+        Membangun tabel hop distance gateway -> node dengan satu BFS per gateway yang melakukan request.
+        Output: dict {"gateways", "node_ids", "hops", "topology"}; hops[g][n] = -1 jika tidak ada path.
+        """
+        node_ids = self._ensure_cloud_node()
+        node_index = {nid: idx for idx, nid in enumerate(node_ids)}
+        gateways = self._requesting_gateways()
+        hops = np.full((len(gateways), len(node_ids)), -1, dtype=np.int32)
+        for row, gw in enumerate(gateways):
+            if gw not in self.G:
+                continue
+            for nid, hop in nx.single_source_shortest_path_length(self.G, gw).items():
+                hops[row, node_index[nid]] = hop
+        return {
+            "gateways": gateways,
+            "node_ids": node_ids,
+            "hops": hops,
+            "topology": self._topology_key(node_ids),
+        }
+
+    def _requested_pairs(self):
+        pairs = []
+        seen = set()
+        for req in getattr(self.expconf, "user_requests", None) or []:
+            pair = tuple(req)
+            if pair not in seen:
+                seen.add(pair)
+                pairs.append(pair)
+        return pairs
+
+    def _latency_links(self):
+        # Link fog dari G ditambah link cloud gateway -> cloud (tidak ada di G)
+        links = [(u, v, d.get("PR", 0), d.get("BW", 0)) for u, v, d in self.G.edges(data=True)]
+        for gw in sorted(getattr(self.expconf, "cloud_gateway_devices", ())):
+            links.append((gw, self.cloud_id, self.expconf.CLOUD_PR, self.expconf.CLOUD_BW))
+        return links
+
+    def _node_speed(self, node_ids):
+        speed = getattr(self.expconf, "node_speed", {})
+        return np.array([self.expconf.CLOUD_SPEED if nid == self.cloud_id else speed.get(nid, 0)
+                         for nid in node_ids], dtype=float)
+
+    def _latency_key(self, node_ids):
+        h = hashlib.sha1()
+        h.update(self._topology_key(node_ids).encode())
+        h.update(json.dumps(sorted([str(u), str(v), pr, bw] for u, v, pr, bw in self._latency_links())).encode())
+        h.update(self._node_speed(node_ids).tobytes())
+        h.update(json.dumps(sorted(getattr(self.expconf, "service_instructions", {}).items())).encode())
+        h.update(json.dumps(sorted(getattr(self.expconf, "service_message_bytes", {}).items())).encode())
+        return h.hexdigest()
+
+    def build_latency_table(self):
+        """
+        Tabel latency (ms) per pasangan (gateway, service) -> node, dibangun sekali per topologi.
+        Latency = jalur terpendek gateway -> node dengan bobot PR + bytes / BW (link cloud ikut)
+        ditambah waktu eksekusi instructions / IPT di node; instructions dan bytes diambil dari
+        pesan masuk service. Jalur dipilih dengan ukuran pesan rata-rata.
+        Output: dict {"pairs", "node_ids", "latency", "topology"}; latency = inf jika tidak ada path.
+        """
+        node_ids = self._ensure_cloud_node()
+        node_index = {nid: idx for idx, nid in enumerate(node_ids)}
+        num_nodes = len(node_ids)
+        directed = self.G.is_directed()
+        adjacency = [[] for _ in range(num_nodes)]
+        for u, v, pr, bw in self._latency_links():
+            inv_bw = 1.0 / bw if bw else np.inf
+            adjacency[node_index[u]].append((node_index[v], pr, inv_bw))
+            if not directed:
+                adjacency[node_index[v]].append((node_index[u], pr, inv_bw))
+
+        pairs = self._requested_pairs()
+        instructions = getattr(self.expconf, "service_instructions", {})
+        message_bytes = getattr(self.expconf, "service_message_bytes", {})
+        pair_instr = np.array([instructions.get(sid, 0) for _, sid in pairs], dtype=float)
+        pair_bytes = np.array([message_bytes.get(sid, 0) for _, sid in pairs], dtype=float)
+        ref_bytes = float(np.mean(list(message_bytes.values()))) if message_bytes else 0.0
+
+        gateways = list(dict.fromkeys(gw for gw, _ in pairs))
+        gateway_row = {gw: row for row, gw in enumerate(gateways)}
+        sum_pr = np.full((len(gateways), num_nodes), np.inf)
+        sum_inv_bw = np.full((len(gateways), num_nodes), np.inf)
+        for row, gw in enumerate(gateways):
+            if gw in node_index:
+                sum_pr[row], sum_inv_bw[row] = _path_latency(adjacency, node_index[gw], num_nodes, ref_bytes)
+
+        rows = np.array([gateway_row[gw] for gw, _ in pairs], dtype=np.intp)
+        speed = self._node_speed(node_ids)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exec_time = np.where(speed > 0, pair_instr[:, None] / speed[None, :], np.inf)
+            latency = sum_pr[rows] + pair_bytes[:, None] * sum_inv_bw[rows] + exec_time
+        latency[np.isnan(latency)] = np.inf
+        return {
+            "pairs": pairs,
+            "node_ids": node_ids,
+            "latency": latency,
+            "topology": self._latency_key(node_ids),
+        }
+
+    def save_distance_table(self, path, table=None):
+        # table None: tabel hop (get_distance_table); tabel latency bisa diberikan eksplisit
+        table = self.get_distance_table() if table is None else table
+        arrays = {"node_ids": np.array(table["node_ids"]), "topology": np.array(table["topology"])}
+        if "pairs" in table:
+            arrays["pairs"] = np.array(table["pairs"]).reshape(-1, 2)
+            arrays["latency"] = table["latency"]
+        else:
+            arrays["gateways"] = np.array(table["gateways"])
+            arrays["hops"] = table["hops"]
+        np.savez_compressed(path, **arrays)
+
+    @staticmethod
+    def load_distance_table(path):
+        with np.load(path, allow_pickle=False) as data:
+            table = {
+                "node_ids": data["node_ids"].tolist(),
+                "topology": str(data["topology"]),
+            }
+            if "pairs" in data:
+                table["pairs"] = [tuple(pair) for pair in data["pairs"].tolist()]
+                table["latency"] = data["latency"]
+            else:
+                table["gateways"] = data["gateways"].tolist()
+                table["hops"] = data["hops"]
+            return table
+
+    def get_distance_table(self):
+        table = self.distance_table
+        if isinstance(table, (str, os.PathLike)):
+            table = self.load_distance_table(table)
+        if table is not None:
+            node_ids = self._ensure_cloud_node()
+            if "hops" not in table or table["topology"] != self._topology_key(node_ids) or \
+                    not set(self._requesting_gateways()) <= set(table["gateways"]):
+                print("[WARNING] distance table tidak cocok dengan topologi/request, dibangun ulang.")
+                table = None
+        if table is None:
+            with self.instr.timer("distance_table"):
+                table = self.build_distance_table()
+        self.distance_table = table
+        return table
+
+    def get_latency_table(self):
+        table = self.latency_table
+        if isinstance(table, (str, os.PathLike)):
+            table = self.load_distance_table(table)
+        if table is not None:
+            node_ids = self._ensure_cloud_node()
+            if "latency" not in table or table["topology"] != self._latency_key(node_ids) or \
+                    not set(self._requested_pairs()) <= set(table["pairs"]):
+                print("[WARNING] latency table tidak cocok dengan topologi/request, dibangun ulang.")
+                table = None
+        if table is None:
+            with self.instr.timer("latency_table"):
+                table = self.build_latency_table()
+        self.latency_table = table
+        return table
 
-    def calculateDistancesRequest(self, service2DevicePlacementMatrix):
+    def get_cost_table(self):
+        # Tabel yang dipakai fitness sesuai objective
+        if self.objective == "latency":
+            return self.get_latency_table()
+        return self.get_distance_table()
+
+    def _as_placement(self, placement):
+        if isinstance(placement, Placement):
+            return placement
+        return Placement.from_matrix(placement, self._ensure_cloud_node())
+
+    def calculateDistancesRequest(self, placement):
         """
         Menghitung distribusi hop distance antara IoT device yang request dan node tempat service ditempatkan.
+        placement: Placement (atau placement matrix lama).
         Output: dict {hop_distance: jumlah}
         """
         distances = {}
@@ -28,168 +904,592 @@ class GAOptimization:
             print("[WARNING] user_requests kosong, delay tidak bisa dihitung!")
             return distances
 
-        for iot_dev, service_id in user_requests:
-            # Cek validitas index service_id
-            if service_id < 0 or service_id >= len(service2DevicePlacementMatrix):
-                print(f"[WARNING] service_id {service_id} di luar range!")
-                continue
-            placement_row = service2DevicePlacementMatrix[service_id]
-            try:
-                placed_dev = placement_row.index(1)
-            except ValueError:
-                print(f"[WARNING] Service {service_id} tidak ditempatkan di node manapun.")
-                continue
-            try:
-                hop = nx.shortest_path_length(self.G, source=iot_dev, target=placed_dev)
-            except (nx.NetworkXNoPath, nx.NodeNotFound):
-                print(f"[WARNING] Tidak ada path dari IoT {iot_dev} ke node {placed_dev}.")
-                continue
-            distances[hop] = distances.get(hop, 0) + 1
+        placement = self._as_placement(placement)
+        table = self.get_distance_table()
+        gateway_row = {gw: row for row, gw in enumerate(table["gateways"])}
+        hops = table["hops"]
+
+        req_rows = np.array([gateway_row[iot_dev] for iot_dev, _ in user_requests], dtype=np.intp)
+        req_services = np.array([service_id for _, service_id in user_requests], dtype=np.intp)
+        # Cek validitas index service_id
+        valid = (req_services >= 0) & (req_services < len(placement))
+        for service_id in req_services[~valid]:
+            print(f"[WARNING] service_id {service_id} di luar range!")
+        req_rows, req_services = req_rows[valid], req_services[valid]
+        placed_dev = placement.nodes[req_services]
+        for service_id in np.unique(req_services[placed_dev < 0]):
+            print(f"[WARNING] Service {service_id} tidak ditempatkan di node manapun.")
+        req_rows, placed_dev = req_rows[placed_dev >= 0], placed_dev[placed_dev >= 0]
+
+        req_hops = hops[req_rows, placed_dev]
+        for row, dev in zip(req_rows[req_hops < 0], placed_dev[req_hops < 0]):
+            print(f"[WARNING] Tidak ada path dari IoT {table['gateways'][row]} ke node {dev}.")
+        values, counts = np.unique(req_hops[req_hops >= 0], return_counts=True)
+        distances = dict(zip(values.tolist(), counts.tolist()))
 
         print(f"[INFO] Jumlah request dihitung: {len(user_requests)}")
         print(f"[INFO] Distribusi delay (hop): {distances}")
         return distances
-    
-    def calculateNodeUsage(self, service2DevicePlacementMatrix):
-        nodeResUse = [0.0 for _ in self.G.nodes]
-        nodeNumServ = [0 for _ in self.G.nodes]
-        for idServ in range(len(service2DevicePlacementMatrix)):
-            for idDev in range(len(service2DevicePlacementMatrix[idServ])):
-                if service2DevicePlacementMatrix[idServ][idDev] == 1:
-                    nodeNumServ[idDev] += 1
-                    nodeResUse[idDev] += self.expconf.service_resources[idServ]
-        for idDev in range(len(nodeResUse)):
-            if self.expconf.node_resources[idDev] > 0:
-                nodeResUse[idDev] = nodeResUse[idDev] / self.expconf.node_resources[idDev]
-            else:
-                nodeResUse[idDev] = 0.0
-        nodeResUse = sorted(nodeResUse)
-        nodeNumServ = sorted(nodeNumServ)
-        
+
+    def calculateNodeUsage(self, placement):
+        placement = self._as_placement(placement)
+        node_ids = placement.node_ids
+        nodes = placement.nodes[placement.nodes >= 0]
+        services = np.flatnonzero(placement.nodes >= 0)
+        service_res = np.array([self.expconf.service_resources[sid] for sid in services.tolist()], dtype=float)
+        nodeNumServ = np.bincount(nodes, minlength=len(node_ids))
+        nodeResUse = np.bincount(nodes, weights=service_res, minlength=len(node_ids))
+        node_res = np.array([self.expconf.node_resources[nid] for nid in node_ids], dtype=float)
+        nodeResUse = np.divide(nodeResUse, node_res, out=np.zeros_like(nodeResUse), where=node_res > 0)
+        nodeResUse = sorted(nodeResUse.tolist())
+        nodeNumServ = sorted(nodeNumServ.tolist())
+
         return nodeResUse, nodeNumServ
 
-    # ===================== GA Service Placement =====================
-    def ga_service_placement(self, pop_size=30, generations=50, mutation_rate=0.1):
-        # Pastikan cloud node sudah ada sebelum ambil node_ids
-        if self.cloud_id not in self.G.nodes:
-            self.G.add_node(self.cloud_id)
-        node_ids = list(self.G.nodes)
-        num_nodes = len(node_ids)
-        service_resources = self.expconf.service_resources
-        node_resources = self.expconf.node_resources
-        cloud_id = self.cloud_id
+    @instrumented("build_problem")
+    def build_problem(self):
+        node_ids = self._ensure_cloud_node()
+        return PlacementProblem(
+            node_ids,
+            self.cloud_id,
+            self.expconf.service_resources,
+            self.expconf.node_resources,
+            self.expconf.number_of_services,
+            getattr(self.expconf, "user_requests", None) or [],
+            self.get_cost_table(),
+        )
 
-        # Pastikan resource cloud ada
-        if cloud_id not in node_resources:
-            node_resources[cloud_id] = 1e12
+    def evaluate_population(self, population):
+        return self.build_problem().evaluate(population)
 
+    def _worker_initargs(self, problem):
+        return (
+            self.G,
+            self.cloud_id,
+            self.expconf.service_resources,
+            self.expconf.node_resources,
+            problem.num_services,
+            getattr(self.expconf, "user_requests", None) or [],
+            self.get_cost_table(),
+        )
+
+    def _start_pool(self, problem):
+        if not self.workers or self.workers <= 1:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=self._worker_initargs(problem),
+        )
+
+    def _evaluate(self, problem, population, pool=None):
+        if self.fitness_cache is not None:
+            return self.fitness_cache.evaluate(population, lambda pop: self._evaluate_uncached(problem, pop, pool))
+        return self._evaluate_uncached(problem, population, pool)
+
+    def _evaluate_uncached(self, problem, population, pool=None):
+        self.instr.count("fitness_evaluations", len(population))
+        if pool is None:
+            return problem.evaluate(population)
+        # Urutan chunk tetap, sehingga hasil tidak bergantung pada jumlah worker
+        chunks = np.array_split(population, self.workers)
+        return np.concatenate(list(pool.map(_evaluate_chunk, chunks)))
+
+    def cache_stats(self):
+        if self.fitness_cache is None:
+            return None
+        return self.fitness_cache.stats()
+
+    def prepare_warm_start(self, previous, perturbation_rate=0.1):
+        """
+        Menyiapkan warm start dari alokasi sebelumnya: path allocDefinitionGA.json, dict alokasi,
+        placement matrix, atau list node per service. Service baru, service di node yang sudah
+        dihapus, dan service di node yang kapasitasnya kini terlampaui dioptimasi ulang; service
+        lain tetap di node lamanya. Jika tidak ada perubahan, semua service boleh dioptimasi.
+        Output: dict {"chrom", "free_genes", "perturbation_rate"} untuk ga_service_placement(warm_start=...).
+        """
+        problem = self.build_problem()
+        node_index = {nid: idx for idx, nid in enumerate(problem.node_ids)}
+        num_services = problem.num_services
+        chrom = np.full(num_services, -1, dtype=np.int32)
+
+        if isinstance(previous, (str, os.PathLike)):
+            with open(previous) as f:
+                previous = json.load(f)
+        if isinstance(previous, Placement):
+            for sid, idx in enumerate(previous.nodes[:num_services].tolist()):
+                if 0 <= idx < len(previous.node_ids) and previous.node_ids[idx] in node_index:
+                    chrom[sid] = node_index[previous.node_ids[idx]]
+        elif isinstance(previous, dict):
+            old_nodes = {(str(item["app"]), item["module_name"]): item["id_resource"]
+                         for item in previous["initialAllocation"]}
+            for sid in range(num_services):
+                key = (self.expconf.map_service_to_apps[sid], self.expconf.map_service_id_to_service_name[sid])
+                if key in old_nodes and old_nodes[key] in node_index:
+                    chrom[sid] = node_index[old_nodes[key]]
+        else:
+            for sid, entry in enumerate(list(previous)[:num_services]):
+                if isinstance(entry, (list, tuple, np.ndarray)):
+                    # Baris placement matrix: kolom = index node
+                    cols = np.flatnonzero(np.asarray(entry))
+                    if len(cols) and cols[0] < problem.num_nodes:
+                        chrom[sid] = cols[0]
+                elif entry in node_index:
+                    chrom[sid] = node_index[entry]
+
+        affected = chrom < 0
+        # Node yang kapasitasnya kini terlampaui: semua service di node tersebut dioptimasi ulang
+        placed = ~affected
+        usage = np.bincount(chrom[placed], weights=problem.service_res[placed], minlength=problem.num_nodes)
+        overloaded = np.flatnonzero(usage > problem.node_cap)
+        affected |= np.isin(chrom, overloaded)
+
+        free_genes = np.flatnonzero(affected)
+        print(f"[INFO] warm start: {len(free_genes)} dari {num_services} service dioptimasi ulang")
+        if len(free_genes) == 0:
+            free_genes = np.arange(num_services)
+        return {"chrom": chrom, "free_genes": free_genes, "perturbation_rate": perturbation_rate}
+
+    def _seeded_population(self, problem, pop_size, seed_fraction, seed_strategies):
+        """
+        Populasi awal: round(pop_size * seed_fraction) individu dari heuristik seed_strategies
+        ("greedy" dan/atau "ffd", dibagi bergiliran), sisanya acak seperti random_population.
+        """
+        num_seeded = min(pop_size, int(round(pop_size * seed_fraction)))
+        unknown = set(seed_strategies) - {"greedy", "ffd"}
+        if unknown:
+            raise ValueError(f"seed strategy tidak dikenal: {sorted(unknown)}")
+        parts = []
+        if num_seeded and seed_strategies:
+            counts = [num_seeded // len(seed_strategies) + (k < num_seeded % len(seed_strategies))
+                      for k in range(len(seed_strategies))]
+            for strategy, count in zip(seed_strategies, counts):
+                if strategy == "greedy":
+                    parts.append(greedy_population(problem, count, self.rng))
+                else:
+                    node_centrality = getattr(self.expconf, "node_centrality", {})
+                    centrality = [node_centrality.get(nid, 0.0) for nid in problem.node_ids]
+                    parts.append(ffd_population(problem, count, centrality, self.rng))
+        else:
+            num_seeded = 0
+        parts.append(random_population(pop_size - num_seeded, problem.num_services, problem.num_nodes, self.rng))
+        return np.concatenate(parts)
+
+    def _warm_population(self, warm_start, pop_size, num_nodes):
+        rng = self.rng
+        base = warm_start["chrom"]
+        free_genes = warm_start["free_genes"]
+        population = np.repeat(base[None, :], pop_size, axis=0)
+        for k in range(pop_size):
+            for sid in free_genes:
+                # Individu pertama mempertahankan alokasi lama sejauh masih valid
+                if base[sid] < 0 or (k > 0 and rng.random() < warm_start["perturbation_rate"]):
+                    population[k, sid] = rng.randint(0, num_nodes-1)
+        return population
+
+    # ===================== GA Service Placement =====================
+    @instrumented("ga_service_placement", profile=True)
+    def ga_service_placement(self, pop_size=30, generations=50, mutation_rate=0.1, patience=None,
+                             target_fitness=None, time_budget_ms=None, elitism=0, return_history=False,
+                             warm_start=None, seed_fraction=0.0, seed_strategies=("greedy", "ffd")):
+        """
+        GA placement dengan kriteria berhenti opsional: tidak ada perbaikan selama patience generasi,
+        fitness terbaik >= target_fitness, atau waktu melewati time_budget_ms. elitism individu
+        terbaik selalu dibawa ke generasi berikutnya. Alasan berhenti disimpan di self.stop_reason.
+        warm_start (hasil prepare_warm_start) mengisi populasi awal dari alokasi sebelumnya dan
+        membatasi mutasi pada service yang terdampak. Tanpa warm_start, seed_fraction bagian populasi
+        awal diisi heuristik seed_strategies (lihat greedy_population / ffd_population).
+        Output: (list node, Placement), ditambah history per generasi jika return_history.
+        """
+        t_start = time.perf_counter()
+        problem = self.build_problem()
+        node_ids = problem.node_ids
+        num_nodes = problem.num_nodes
+        num_services = problem.num_services
+        rng = self.rng
+        elitism = min(elitism, pop_size)
+        instr = self.instr
+
+        with instr.timer("init_population"):
+            if warm_start is None:
+                if seed_fraction > 0:
+                    population = self._seeded_population(problem, pop_size, seed_fraction, seed_strategies)
+                else:
+                    population = random_population(pop_size, num_services, num_nodes, rng)
+                genes = None
+            else:
+                population = self._warm_population(warm_start, pop_size, num_nodes)
+                genes = warm_start["free_genes"]
+            if self.repair:
+                problem.repair_population(population)
+        self.fitness_cache = FitnessCache(self.cache_size, num_nodes) if self.cache_size else None
+        pool = None if self.incremental else self._start_pool(problem)
+        history = []
+        best_fit, best_chrom, stale = -np.inf, None, 0
         try:
-            cloud_idx = node_ids.index(cloud_id)
-        except ValueError:
-            raise RuntimeError("Cloud node not found in node_ids after explicit add.")
+            with instr.timer("evaluate"):
+                if self.incremental:
+                    states = [problem.state(chrom) for chrom in population]
+                    fits = np.array([st.fitness for st in states])
+                    instr.count("fitness_evaluations", len(states))
+                else:
+                    fits = self._evaluate(problem, population, pool)
+            gen = 0
+            while True:
+                if self.incremental:
+                    population = np.array([st.chrom for st in states])
+                gen_best = int(np.argmax(fits))
+                if fits[gen_best] > best_fit:
+                    best_fit, best_chrom, stale = fits[gen_best], population[gen_best].copy(), 0
+                else:
+                    stale += 1
+                elapsed_ms = (time.perf_counter() - t_start) * 1000
+                history.append({
+                    "generation": gen,
+                    "best": float(fits[gen_best]),
+                    "mean": float(fits.mean()),
+                    "diversity": len({row.tobytes() for row in population}) / len(population),
+                    "elapsed_ms": elapsed_ms,
+                })
 
-        def random_chrom():
-            return [random.randint(0, num_nodes-1) for _ in range(self.expconf.number_of_services)]
-
-        def chrom_to_matrix(chrom):
-            matrix = [[0 for _ in range(num_nodes)] for _ in range(self.expconf.number_of_services)]
-            for sid, idx in enumerate(chrom):
-                matrix[sid][idx] = 1
-            return matrix
-
-        def fitness(chrom):
-            usage = [0.0 for _ in range(num_nodes)]
-            
-            for sid, idx in enumerate(chrom):
- 
-                if idx >= num_nodes:
-                    raise ValueError(f"Chromosome index {idx} out of range for node_ids (len={num_nodes})")
-                if sid in service_resources:
-                    usage[idx] += service_resources[sid]
+                if gen >= generations:
+                    self.stop_reason = "generations"
+                elif patience is not None and stale >= patience:
+                    self.stop_reason = "patience"
+                elif target_fitness is not None and best_fit >= target_fitness:
+                    self.stop_reason = "target_fitness"
+                elif time_budget_ms is not None and elapsed_ms >= time_budget_ms:
+                    self.stop_reason = "time_budget"
                 else:
-                    print(f"[ERROR] sid {sid} tidak ada di service_resources, diisi 0")
-                    usage[idx] += 0
-            penalty = 0
-            for idx in range(num_nodes):
-                if usage[idx] > node_resources[node_ids[idx]]:
-                    penalty += 10000 * (usage[idx] - node_resources[node_ids[idx]])
-            total_hop = 0
-            if hasattr(self.expconf, "user_requests"):
-                for iot_id, service_id in self.expconf.user_requests:
-                    node_id = node_ids[chrom[service_id]]
-                    try:
-                        hop = nx.shortest_path_length(self.G, source=iot_id, target=node_id)
-                    except:
-                        hop = 100
-                    total_hop += hop
-            fog_penalty = sum(1 for idx in chrom if idx == cloud_idx) * 0.1
-            return -(total_hop + penalty + fog_penalty)
-
-        def selection(pop, fits):
-            idx1, idx2 = random.sample(range(len(pop)), 2)
-            return pop[idx1] if fits[idx1] > fits[idx2] else pop[idx2]
-
-        def crossover(p1, p2):
-            point = random.randint(1, self.expconf.number_of_services-1)
-            return p1[:point] + p2[point:]
-
-        def mutate(chrom):
-            idx = random.randint(0, self.expconf.number_of_services-1)
-            chrom[idx] = random.randint(0, num_nodes-1)
-            return chrom
-
-        population = [random_chrom() for _ in range(pop_size)]
-        for gen in range(generations):
-            fits = [fitness(ch) for ch in population]
-            new_pop = []
-            for _ in range(pop_size):
-                p1 = selection(population, fits)
-                p2 = selection(population, fits)
-                child = crossover(p1, p2)
-                if random.random() < mutation_rate:
-                    child = mutate(child)
-                new_pop.append(child)
-            population = new_pop
-        fits = [fitness(ch) for ch in population]
-        best_idx = fits.index(max(fits))
-        best_chrom = population[best_idx]
-        return [node_ids[idx] for idx in best_chrom], chrom_to_matrix(best_chrom)
+                    self.stop_reason = None
+                if self.stop_reason:
+                    break
+
+                elites = np.argsort(-fits, kind="stable")[:elitism]
+                # Seleksi, crossover dan mutasi berjalan dalam satu loop breeding -> satu timer "breed"
+                if self.incremental:
+                    with instr.timer("breed"):
+                        children = breed_states(problem, states, fits, mutation_rate, rng, genes)
+                    if instr.enabled:
+                        instr.count("infeasible_children", sum(1 for st in children if st.penalty > 0))
+                    if self.repair:
+                        with instr.timer("repair"):
+                            children = [problem.repair_state(child) for child in children]
+                    children[:elitism] = [states[i] for i in elites]
+                    states = children
+                    with instr.timer("evaluate"):
+                        fits = np.array([st.fitness for st in states])
+                    instr.count("fitness_evaluations", len(states))
+                else:
+                    with instr.timer("breed"):
+                        children = breed(population, fits, num_nodes, mutation_rate, rng, genes)
+                    if instr.enabled:
+                        instr.count("infeasible_children", problem.infeasible_count(children))
+                    if self.repair:
+                        with instr.timer("repair"):
+                            instr.count("repaired_children", problem.repair_population(children))
+                    children[:elitism] = population[elites]
+                    population = children
+                    with instr.timer("evaluate"):
+                        fits = self._evaluate(problem, population, pool)
+                gen += 1
+                instr.count("generations")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if self.fitness_cache is not None:
+            stats = self.fitness_cache.stats()
+            instr.count("cache_hits", stats["hits"])
+            instr.count("cache_misses", stats["misses"])
+        result = ([node_ids[idx] for idx in best_chrom.tolist()], problem.placement(best_chrom))
+        if return_history:
+            return result + (history,)
+        return result
+
+    @instrumented("ga_island_placement", profile=True)
+    def ga_island_placement(self, num_islands=4, pop_size=30, generations=50, mutation_rate=0.1,
+                            migration_interval=10, migration_size=2, topology="ring"):
+        """
+        Island model: num_islands sub-populasi berjalan di proses terpisah dan setiap
+        migration_interval generasi menukar migration_size individu terbaik (topology "ring" atau "full").
+        Output sama dengan ga_service_placement: (list node, Placement).
+        """
+        if topology not in ("ring", "full"):
+            raise ValueError(f"Unknown island topology: {topology}")
+        if num_islands < 1:
+            raise ValueError(f"num_islands must be >= 1, got {num_islands}")
+        if migration_interval < 1:
+            raise ValueError(f"migration_interval must be >= 1, got {migration_interval}")
+        if not 0 <= migration_size <= pop_size:
+            raise ValueError(f"migration_size must be in [0, pop_size], got {migration_size}")
+        problem = self.build_problem()
+        node_ids = problem.node_ids
+
+        # Setiap pulau punya RNG sendiri yang diturunkan dari self.rng
+        island_rngs = [random.Random(self.rng.getrandbits(64)) for _ in range(num_islands)]
+        islands = [
+            [random_population(pop_size, problem.num_services, problem.num_nodes, rng), None, rng.getstate()]
+            for rng in island_rngs
+        ]
+        if self.repair:
+            for island in islands:
+                problem.repair_population(island[0])
+        pool = ProcessPoolExecutor(
+            max_workers=min(num_islands, self.workers or num_islands),
+            initializer=_init_worker,
+            initargs=self._worker_initargs(problem),
+        )
+        try:
+            done = 0
+            while done < generations or islands[0][1] is None:
+                step = min(migration_interval, generations - done)
+                futures = [pool.submit(_run_island, pop, fits, step, mutation_rate, state, self.repair)
+                           for pop, fits, state in islands]
+                islands = [list(f.result()) for f in futures]
+                done += step
+                if done < generations:
+                    self._migrate(islands, migration_size, topology)
+        finally:
+            pool.shutdown()
+
+        best_pop, best_fits, _ = max(islands, key=lambda island: island[1].max())
+        best_chrom = best_pop[int(np.argmax(best_fits))]
+        return [node_ids[idx] for idx in best_chrom.tolist()], problem.placement(best_chrom)
+
+    @instrumented("ga_hierarchical_placement", profile=True)
+    def ga_hierarchical_placement(self, pop_size=30, generations=50, mutation_rate=0.1,
+                                  community_generations=50, community_params=None):
+        """
+        Placement hierarkis: GACommunity (objective "structure") membagi graph fog menjadi
+        num_communities komunitas, setiap service diberikan ke komunitas tempat sebagian besar
+        gateway yang me-request-nya berada, lalu GA kecil per komunitas (node lokal + cloud)
+        dijalankan paralel. Overflow kapasitas setelah penggabungan dipindahkan ke cloud.
+        Output sama dengan ga_service_placement: (list node, Placement).
+        """
+        problem = self.build_problem()
+        node_ids = problem.node_ids
+        node_index = {nid: idx for idx, nid in enumerate(node_ids)}
+
+        fog_graph = self.G.subgraph([n for n in self.G.nodes if n != self.cloud_id]).copy()
+        for n in fog_graph.nodes:
+            fog_graph.nodes[n]["RAM"] = self.expconf.node_resources.get(n, 0)
+            fog_graph.nodes[n]["IPT"] = getattr(self.expconf, "node_speed", {}).get(n, 0)
+        params = {"objective": "structure", "generations": community_generations}
+        params.update(community_params or {})
+        ga_community = GACommunity(fog_graph, self.num_communities, **params)
+        best_partition, _ = ga_community.run()
+        communities = ga_community.communities(best_partition)
+        community_ids = sorted(communities)
+        node_community = {n: cid for cid, nodes in communities.items() for n in nodes}
+
+        # Service -> komunitas dengan request terbanyak yang anggarannya masih cukup; anggaran
+        # sebanding kapasitas komunitas agar beban (dan pekerjaan GA) tersebar merata
+        votes = np.zeros((problem.num_services, len(community_ids)), dtype=np.int64)
+        community_pos = {cid: pos for pos, cid in enumerate(community_ids)}
+        for iot_id, service_id in getattr(self.expconf, "user_requests", None) or []:
+            if iot_id in node_community:
+                votes[service_id, community_pos[node_community[iot_id]]] += 1
+        capacity = np.array([sum(self.expconf.node_resources.get(n, 0) for n in communities[cid])
+                             for cid in community_ids], dtype=float)
+        load = problem.service_res.sum() / capacity.sum() if capacity.sum() > 0 else 1.0
+        remaining = capacity * min(1.0, load)
+        owner = np.empty(problem.num_services, dtype=np.intp)
+        for sid in np.argsort(-problem.service_res, kind="stable"):
+            # Urut berdasarkan jumlah request, lalu kapasitas sisa terbesar
+            ranked = np.lexsort((-remaining, -votes[sid]))
+            fits = ranked[remaining[ranked] >= problem.service_res[sid]]
+            owner[sid] = fits[0] if len(fits) else ranked[0]
+            remaining[owner[sid]] -= problem.service_res[sid]
+
+        chrom = np.full(problem.num_services, problem.cloud_idx, dtype=np.int32)
+        tasks = []
+        for pos, cid in enumerate(community_ids):
+            services = np.flatnonzero(owner == pos)
+            if len(services) == 0:
+                continue
+            columns = np.array([node_index[n] for n in communities[cid]], dtype=np.intp)
+            sub = problem.subproblem(services, columns)
+            tasks.append((services, sub, self.rng.getrandbits(64)))
+        print(f"[INFO] hierarchical: {len(communities)} komunitas, {len(tasks)} sub-GA")
+
+        with ProcessPoolExecutor(max_workers=max(1, min(len(tasks), self.workers or len(tasks)))) as pool:
+            futures = [pool.submit(_solve_subproblem, sub, pop_size, generations, mutation_rate, seed,
+                                   self.repair)
+                       for _, sub, seed in tasks]
+            for (services, sub, _), future in zip(tasks, futures):
+                local_best = future.result()
+                chrom[services] = [node_index[sub.node_ids[idx]] for idx in local_best.tolist()]
+
+        if self.repair:
+            moved = problem.repair(chrom)
+            if moved:
+                print(f"[INFO] hierarchical: {moved} service dipindahkan (repair) karena overflow")
+        else:
+            moved = self._reconcile_overflow(problem, chrom)
+            if moved:
+                print(f"[INFO] hierarchical: {moved} service dipindahkan ke cloud karena overflow")
+        return [node_ids[idx] for idx in chrom.tolist()], problem.placement(chrom)
+
+    # Nama kolom PlacementProblem.objectives()
+    NSGA_OBJECTIVES = ("total_cost", "imbalance", "services_in_cloud")
+
+    @instrumented("ga_nsga2_placement", profile=True)
+    def ga_nsga2_placement(self, pop_size=30, generations=50, mutation_rate=0.1, seed_fraction=0.0,
+                           seed_strategies=("greedy", "ffd")):
+        """
+        NSGA-II: total cost request vs ketidakseimbangan resource vs service di cloud, tanpa bobot.
+        Overflow kapasitas ditangani lewat constraint domination (atau repair jika self.repair).
+        Output: list front Pareto (individu unik, urut total_cost), masing-masing dict
+        {"nodes", "placement", "objectives", "violation"}; objectives mengikuti NSGA_OBJECTIVES.
+        """
+        problem = self.build_problem()
+        node_ids = problem.node_ids
+        rng = self.rng
+        instr = self.instr
+        with instr.timer("init_population"):
+            if seed_fraction > 0:
+                population = self._seeded_population(problem, pop_size, seed_fraction, seed_strategies)
+            else:
+                population = random_population(pop_size, problem.num_services, problem.num_nodes, rng)
+            if self.repair:
+                problem.repair_population(population)
+        with instr.timer("evaluate"):
+            objs, violation = problem.objectives(population)
+        instr.count("fitness_evaluations", len(population))
+        ranks = non_dominated_sort(objs, violation)
+        fits = crowded_fitness(ranks, crowding_distance(objs, ranks))
+
+        for _ in range(generations):
+            with instr.timer("breed"):
+                children = breed(population, fits, problem.num_nodes, mutation_rate, rng)
+            if self.repair:
+                with instr.timer("repair"):
+                    instr.count("repaired_children", problem.repair_population(children))
+            with instr.timer("evaluate"):
+                child_objs, child_violation = problem.objectives(children)
+            instr.count("fitness_evaluations", len(children))
+            instr.count("infeasible_children", int((child_violation > 0).sum()))
+            # Seleksi lingkungan (mu + lambda) dari parent dan anak
+            with instr.timer("select"):
+                merged = np.concatenate((population, children))
+                merged_objs = np.concatenate((objs, child_objs))
+                merged_violation = np.concatenate((violation, child_violation))
+                merged_ranks = non_dominated_sort(merged_objs, merged_violation)
+                merged_fits = crowded_fitness(merged_ranks, crowding_distance(merged_objs, merged_ranks))
+                keep = np.argsort(-merged_fits, kind="stable")[:pop_size]
+                population, objs, violation = merged[keep], merged_objs[keep], merged_violation[keep]
+                # Semua yang mendominasi survivor ikut terpilih (rank lebih kecil), jadi rank
+                # tidak berubah; cukup crowding distance yang dihitung ulang
+                ranks = merged_ranks[keep]
+                fits = crowded_fitness(ranks, crowding_distance(objs, ranks))
+            instr.count("generations")
+
+        front = []
+        seen = set()
+        for idx in np.flatnonzero(ranks == 0)[np.argsort(objs[ranks == 0, 0], kind="stable")].tolist():
+            key = population[idx].tobytes()
+            if key in seen:
+                continue
+            seen.add(key)
+            chrom = population[idx].copy()
+            front.append({
+                "nodes": [node_ids[i] for i in chrom.tolist()],
+                "placement": problem.placement(chrom),
+                "objectives": dict(zip(self.NSGA_OBJECTIVES, objs[idx].tolist())),
+                "violation": float(violation[idx]),
+            })
+        return front
+
+    @staticmethod
+    def _reconcile_overflow(problem, chrom):
+        usage = np.bincount(chrom, weights=problem.service_res, minlength=problem.num_nodes)
+        moved = 0
+        for node in np.flatnonzero(usage > problem.node_cap):
+            if node == problem.cloud_idx:
+                continue
+            # Service terbesar dipindahkan lebih dulu agar jumlah perpindahan minimal
+            services = np.flatnonzero(chrom == node)
+            for sid in services[np.argsort(-problem.service_res[services], kind="stable")]:
+                if usage[node] <= problem.node_cap[node]:
+                    break
+                chrom[sid] = problem.cloud_idx
+                usage[node] -= problem.service_res[sid]
+                moved += 1
+        return moved
+
+    @staticmethod
+    def _migrate(islands, migration_size, topology):
+        num_islands = len(islands)
+        # Emigran diambil dulu dari semua pulau sebelum ada yang diganti
+        emigrants = []
+        for pop, fits, _ in islands:
+            top = np.argsort(-fits, kind="stable")[:migration_size]
+            emigrants.append((pop[top].copy(), fits[top].copy()))
+        for i, island in enumerate(islands):
+            if topology == "ring":
+                sources = [(i - 1) % num_islands]
+            else:
+                sources = [j for j in range(num_islands) if j != i]
+            in_pop = np.concatenate([emigrants[j][0] for j in sources])
+            in_fits = np.concatenate([emigrants[j][1] for j in sources])
+            best_in = np.argsort(-in_fits, kind="stable")[:migration_size]
+            pop, fits, _ = island
+            worst = np.argsort(fits, kind="stable")[:len(best_in)]
+            pop[worst] = in_pop[best_in]
+            fits[worst] = in_fits[best_in]
     # ===================== END GA Service Placement =====================
 
-    def solve(self, verbose=True):
+    def solve(self, verbose=True, warm_start=None, mode="flat", **ga_params):
         t = time.time()
         print("=== GA Optimization (Service Placement) ===")
 
         # 1. Jalankan GA Service Placement
-        best_chrom, service2DevicePlacementMatrixGA = self.ga_service_placement(
-            pop_size=30, generations=50, mutation_rate=0.1
-        )
+        params = {"pop_size": 30, "generations": 50, "mutation_rate": 0.1}
+        params.update(ga_params)
+        if warm_start is not None:
+            if mode != "flat":
+                raise ValueError("warm_start hanya didukung pada mode flat")
+            params["warm_start"] = self.prepare_warm_start(warm_start)
+        if mode == "hierarchical":
+            best_chrom, placementGA = self.ga_hierarchical_placement(**params)
+            self.historyGA = []
+        elif mode == "island":
+            best_chrom, placementGA = self.ga_island_placement(**params)
+            self.historyGA = []
+        elif mode == "nsga2":
+            # Front lengkap di self.paretoFront; yang diekspor adalah anggota front dengan
+            # fitness skalar terbaik agar hasil tetap sebanding dengan mode lain
+            self.paretoFront = self.ga_nsga2_placement(**params)
+            problem = self.build_problem()
+            chosen = max(self.paretoFront, key=lambda sol: problem.fitness(sol["placement"].nodes))
+            best_chrom, placementGA = chosen["nodes"], chosen["placement"]
+            self.historyGA = []
+            print(f"NSGA-II: {len(self.paretoFront)} solusi di front Pareto")
+        else:
+            best_chrom, placementGA, self.historyGA = self.ga_service_placement(
+                return_history=True, **params
+            )
+            print(f"GA berhenti pada generasi {self.historyGA[-1]['generation']} ({self.stop_reason})")
 
         num_services = self.expconf.number_of_services
         node_ids = self.all_nodes
         node_id_to_idx = {nid: idx for idx, nid in enumerate(node_ids)}
         servicesInCloud = 0
         servicesInFog = 0
-        allAlloc = {}
-        myAllocationList = []
 
         for idServ, devId in enumerate(best_chrom):
             if devId == self.cloud_id:
                 servicesInCloud += 1
             else:
                 servicesInFog += 1
-            myAllocation = {
-                "app": self.expconf.map_service_to_apps[idServ],
-                "module_name": self.expconf.map_service_id_to_service_name[idServ],
-                "id_resource": devId
-            }
-            myAllocationList.append(myAllocation)
 
         # Statistik penggunaan node
-        nodeResUseGA, nodeNumServGA = self.calculateNodeUsage(service2DevicePlacementMatrixGA)
-        self.nodeResUseGA = nodeResUseGA
-        self.nodeNumServGA = nodeNumServGA
-        self.statisticsDistancesRequestGA = self.calculateDistancesRequest(service2DevicePlacementMatrixGA)
+        with self.instr.timer("statistics"):
+            nodeResUseGA, nodeNumServGA = self.calculateNodeUsage(placementGA)
+            self.nodeResUseGA = nodeResUseGA
+            self.nodeNumServGA = nodeNumServGA
+            self.statisticsDistancesRequestGA = self.calculateDistancesRequest(placementGA)
         print("Number of services in cloud (GA):", servicesInCloud)
         print("Number of services in fog (GA):", servicesInFog)
 
@@ -197,6 +1497,35 @@ class GAOptimization:
         avg_resource_usage = sum(nodeResUseGA) / len(nodeResUseGA) if nodeResUseGA else 0
         print("Average Resource Usage (GA): {:.4f}".format(avg_resource_usage))
 
+        with self.instr.timer("export"):
+            output_path = self.export_allocation(best_chrom)
+
+        print("Allocation saved to", output_path)
+        print(str(time.time() - t) + " seconds for GA-based")
+        # Trace per run (hanya jika PLACEMENT_TRACE / instrumentation aktif)
+        self.instr.meta.update({
+            "mode": mode,
+            "objective": self.objective,
+            "services": num_services,
+            "nodes": len(node_ids),
+            "stop_reason": getattr(self, "stop_reason", None),
+            **{k: v for k, v in params.items() if k != "warm_start"},
+        })
+        self.trace_path = self.instr.export()
+        if self.trace_path:
+            print("Trace saved to", self.trace_path)
+        return placementGA
+
+    def export_allocation(self, best_chrom):
+        allAlloc = {}
+        myAllocationList = []
+        for idServ, devId in enumerate(best_chrom):
+            myAllocation = {
+                "app": self.expconf.map_service_to_apps[idServ],
+                "module_name": self.expconf.map_service_id_to_service_name[idServ],
+                "id_resource": devId
+            }
+            myAllocationList.append(myAllocation)
         allAlloc["initialAllocation"] = myAllocationList
 
         # Simpan ke appAllocation.json
@@ -206,9 +1535,7 @@ class GAOptimization:
             os.makedirs(output_dir)
         with open(output_path, "w") as file:
             file.write(json.dumps(allAlloc, indent=2))
-
-        print("Allocation saved to", output_path)
-        print(str(time.time() - t) + " seconds for GA-based")
+        return output_path
 
 if __name__ == "__main__":
     # 1. Load experiment configuration (no dummy, no halu)
@@ -219,13 +1546,12 @@ if __name__ == "__main__":
             self.graphic_terminal = False
 
     config = Config()
-    expconf = ExperimentConfiguration(config)
+    expconf = ExperimentConfiguration(config, seed=1)
     expconf.load_configuration("iotjournal")  # atau preset lain sesuai kebutuhanmu
-    expconf.network_generation()
-    expconf.app_generation()
+    expconf.generate_scenario(cache_dir=os.path.join("results", "scenario_cache"))
 
     # 2. Jalankan GAOptimization
-    gaopt = GAOptimization(expconf, config, num_communities=3)
+    gaopt = GAOptimization(expconf, config, num_communities=3, seed=expconf.seed)
     ga_matrix = gaopt.solve(verbose=True)
     print("GA Placement Matrix:")
     for row in ga_matrix:
@@ -5,11 +5,16 @@
 # - fitness function
 
 import networkx as nx
+import numpy as np
 import random
 
 class GACommunity:
+    # Batas jumlah elemen array sementara per blok evaluasi mode "structure"
+    EVAL_BLOCK_ELEMENTS = 1 << 22
+
     def __init__(self, graph, num_communities, population_size=50, generations=100, mutation_rate=0.1,
-                 omega_1=1.0, omega_2=1.0, omega_3=1.0, w_RAM=1.0, w_TB=1.0, w_IPT=1.0):
+                 omega_1=1.0, omega_2=1.0, omega_3=1.0, w_RAM=1.0, w_TB=1.0, w_IPT=1.0,
+                 objective="balance", omega_4=1.0, omega_5=1.0):
         self.graph = graph
         self.num_communities = num_communities
         self.population_size = population_size
@@ -22,6 +27,48 @@ class GACommunity:
         self.w_TB = w_TB
         self.w_IPT = w_IPT
 
+        # resource_usage tidak bergantung pada kromosom, cukup dihitung sekali
+        self.resource_usage = sum(
+            self.graph.nodes[node].get('RAM', 0) * self.w_RAM +
+            self.graph.nodes[node].get('STO', 0) * self.w_TB +
+            self.graph.nodes[node].get('IPT', 0) * self.w_IPT
+            for node in self.graph.nodes
+        )
+
+        # objective "balance": fitness asli (ukuran komunitas + resource total)
+        # objective "structure": keseimbangan resource & ukuran per komunitas, edge cut (omega_4)
+        # dan modularity (omega_5) dari adjacency CSR
+        if objective not in ("balance", "structure"):
+            raise ValueError(f"Unknown community objective: {objective}")
+        self.objective = objective
+        self.omega_4 = omega_4
+        self.omega_5 = omega_5
+        if objective == "structure":
+            self._build_structure_arrays()
+
+    def _build_structure_arrays(self):
+        self.node_list = list(self.graph.nodes)
+        node_index = {node: idx for idx, node in enumerate(self.node_list)}
+        n = len(self.node_list)
+        self.node_weight = np.array([
+            self.graph.nodes[node].get('RAM', 0) * self.w_RAM +
+            self.graph.nodes[node].get('STO', 0) * self.w_TB +
+            self.graph.nodes[node].get('IPT', 0) * self.w_IPT
+            for node in self.node_list
+        ], dtype=float)
+
+        # Adjacency CSR (tanpa self-loop), setiap edge tersimpan dua arah
+        edges = np.array([(node_index[u], node_index[v]) for u, v in self.graph.edges() if u != v],
+                         dtype=np.intp).reshape(-1, 2)
+        src = np.concatenate((edges[:, 0], edges[:, 1]))
+        dst = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.argsort(src, kind="stable")
+        self.csr_indices = dst[order]
+        self.csr_indptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=n)))).astype(np.intp)
+        self.degree = np.diff(self.csr_indptr)
+        self.csr_rows = np.repeat(np.arange(n), self.degree)
+        self.num_edges = len(edges)
+
     def initialize_population(self):
         population = []
         for _ in range(self.population_size):
@@ -30,25 +77,76 @@ class GACommunity:
         return population
 
     def fitness_function(self, chromosome):
-        community_counts = {i: 0 for i in range(1, self.num_communities + 1)}
-        for community_id in chromosome:
-            community_counts[community_id] += 1
-        variance = sum((count - (len(chromosome) / self.num_communities))**2 for count in community_counts.values())
-
-        resource_usage = sum(
-            self.graph.nodes[node].get('RAM', 0) * self.w_RAM +
-            self.graph.nodes[node].get('STO', 0) * self.w_TB +
-            self.graph.nodes[node].get('IPT', 0) * self.w_IPT
-            for node in self.graph.nodes
-        )
+        return float(self.evaluate_population([chromosome])[0])
+
+    def evaluate_population(self, population):
+        # Seluruh populasi (pop_size, jumlah node) dinilai sekaligus
+        pop = np.asarray(population, dtype=np.intp)
+        if self.objective == "structure":
+            block = max(1, self.EVAL_BLOCK_ELEMENTS // max(1, len(self.csr_indices), pop.shape[1]))
+            return np.concatenate([self._evaluate_structure(pop[start:start + block])
+                                   for start in range(0, len(pop), block)])
+        size, num_genes = pop.shape
+        k = self.num_communities
+        flat = (pop + (np.arange(size) * (k + 1))[:, None]).ravel()
+        community_counts = np.bincount(flat, minlength=size * (k + 1)).reshape(size, k + 1)[:, 1:]
+        variance = ((community_counts - (num_genes / k)) ** 2).sum(axis=1)
+        unique_communities = (community_counts > 0).sum(axis=1)  # Jumlah komunitas unik
 
         fitness = (
-            self.omega_1 * resource_usage +
+            self.omega_1 * self.resource_usage +
             self.omega_2 * variance +
-            self.omega_3 * len(set(chromosome))  # Jumlah komunitas unik
+            self.omega_3 * unique_communities
         )
         return -fitness  # Minimalkan fitness
 
+    def _community_sums(self, pop, weights=None):
+        size = len(pop)
+        k = self.num_communities
+        flat = (pop + (np.arange(size) * (k + 1))[:, None]).ravel()
+        if weights is not None:
+            weights = np.broadcast_to(weights, pop.shape).ravel()
+        return np.bincount(flat, weights=weights, minlength=size * (k + 1)).reshape(size, k + 1)[:, 1:]
+
+    def _evaluate_structure(self, pop):
+        k = self.num_communities
+        n = pop.shape[1]
+        counts = self._community_sums(pop)
+        size_balance = ((counts / n - 1 / k) ** 2).sum(axis=1)
+        total_weight = self.node_weight.sum()
+        if total_weight > 0:
+            shares = self._community_sums(pop, self.node_weight) / total_weight
+            resource_balance = ((shares - 1 / k) ** 2).sum(axis=1)
+        else:
+            resource_balance = np.zeros(len(pop))
+        unique_communities = (counts > 0).sum(axis=1) / k
+
+        if self.num_edges:
+            # Setiap edge muncul dua kali di CSR
+            cut = (pop[:, self.csr_rows] != pop[:, self.csr_indices]).sum(axis=1) / 2
+            degree_sums = self._community_sums(pop, self.degree.astype(float))
+            modularity = (self.num_edges - cut) / self.num_edges - \
+                ((degree_sums / (2 * self.num_edges)) ** 2).sum(axis=1)
+            cut_fraction = cut / self.num_edges
+        else:
+            cut_fraction = modularity = np.zeros(len(pop))
+
+        fitness = (
+            self.omega_1 * resource_balance +
+            self.omega_2 * size_balance +
+            self.omega_3 * unique_communities +
+            self.omega_4 * cut_fraction -
+            self.omega_5 * modularity
+        )
+        return -fitness
+
+    def communities(self, chromosome):
+        # {community_id: [node, ...]} untuk membagi pekerjaan placement per komunitas
+        groups = {}
+        for node, community_id in zip(self.graph.nodes, chromosome):
+            groups.setdefault(community_id, []).append(node)
+        return groups
+
     def selection(self, population, fitness_values):
         # Roulette wheel selection
         min_fitness = min(fitness_values)
@@ -79,7 +177,7 @@ class GACommunity:
         best_fitness = float('-inf')
 
         for generation in range(self.generations):
-            fitness_values = [self.fitness_function(chromosome) for chromosome in population]
+            fitness_values = self.evaluate_population(population).tolist()
             max_fitness = max(fitness_values)
             if max_fitness > best_fitness:
                 best_fitness = max_fitness
@@ -0,0 +1,169 @@
+# Benchmark skala GA placement
+# - sweep jumlah node, TOTAL_APP_NUMBER, ukuran populasi dan generasi
+# - waktu per fase: network, app, user, GA, community, export JSON
+# - peak memory (tracemalloc) dan evaluasi fitness per detik
+# - hasil JSON + CSV agar bisa dibandingkan antar commit
+#
+# Contoh:
+#   python benchmark_placement.py --nodes 100,1000,10000 --apps 5,20 --pop 30,300 --generations 50
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from experiment_configuration import ExperimentConfiguration
+from GA_Optimization import GAOptimization
+from GA_community import GACommunity
+
+PHASES = ["network_generation", "app_generation", "user_generation", "ga", "community", "json_export"]
+
+
+class BenchmarkConfig:
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.verbose_log = False
+        self.graphic_terminal = False
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextlib.contextmanager
+def phase(timings, name):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - t
+
+
+def run_case(preset, num_nodes, num_apps, pop_size, generations, seed, community_generations, trace_memory):
+    random.seed(seed)
+    np.random.seed(seed)
+    timings = {}
+    with tempfile.TemporaryDirectory() as data_folder, open(os.devnull, "w") as devnull:
+        ec = ExperimentConfiguration(BenchmarkConfig(data_folder))
+        ec.load_configuration(preset)
+        ec.FUNC_NETWORK_GENERATION = re.sub(r"n=\d+", f"n={num_nodes}", ec.FUNC_NETWORK_GENERATION)
+        ec.TOTAL_APP_NUMBER = num_apps
+        # Preset hanya punya deadline untuk 20 aplikasi
+        ec.my_deadlines = [ec.my_deadlines[i % len(ec.my_deadlines)] for i in range(num_apps)]
+
+        if trace_memory:
+            tracemalloc.start()
+        with contextlib.redirect_stdout(devnull):
+            with phase(timings, "network_generation"):
+                ec.network_generation()
+            with phase(timings, "app_generation"):
+                ec.app_generation()
+            with phase(timings, "user_generation"):
+                ec.user_generation()
+                ec.build_user_requests()
+
+            gaopt = GAOptimization(ec, ec.config, seed=seed)
+            with phase(timings, "ga"):
+                best_chrom, _, history = gaopt.ga_service_placement(
+                    pop_size=pop_size, generations=generations, return_history=True
+                )
+            if community_generations:
+                with phase(timings, "community"):
+                    GACommunity(ec.G, num_communities=3, generations=community_generations).run()
+            with phase(timings, "json_export"):
+                gaopt.export_allocation(best_chrom)
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    evaluations = pop_size * len(history)
+    return {
+        "preset": preset,
+        "nodes": num_nodes,
+        "apps": num_apps,
+        "services": ec.number_of_services,
+        "requests": len(ec.user_requests),
+        "pop_size": pop_size,
+        "generations": generations,
+        "seed": seed,
+        **{f"time_{name}": timings.get(name) for name in PHASES},
+        "time_total": sum(timings.values()),
+        "peak_memory_bytes": peak_memory,
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / timings["ga"] if timings["ga"] else None,
+        "best_fitness": history[-1]["best"],
+    }
+
+
+def write_results(results, out_dir, meta):
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    name = f"benchmark_{meta['revision'] or 'norev'}_{stamp}"
+    json_path = os.path.join(out_dir, name + ".json")
+    with open(json_path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    csv_path = os.path.join(out_dir, name + ".csv")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    return json_path, csv_path
+
+
+def int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skala GA placement")
+    parser.add_argument("--preset", default="iotjournal")
+    parser.add_argument("--nodes", type=int_list, default=[100, 1000, 10000])
+    parser.add_argument("--apps", type=int_list, default=[5, 20])
+    parser.add_argument("--pop", type=int_list, default=[30])
+    parser.add_argument("--generations", type=int_list, default=[50])
+    parser.add_argument("--seeds", type=int_list, default=[1])
+    parser.add_argument("--community-generations", type=int, default=0,
+                        help="0 = fase GACommunity dilewati")
+    parser.add_argument("--no-memory", action="store_true", help="matikan tracemalloc (lebih cepat)")
+    parser.add_argument("--out", default=os.path.join("results", "benchmark"))
+    args = parser.parse_args()
+
+    meta = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "preset": args.preset,
+    }
+    results = []
+    for num_nodes, num_apps, pop_size, generations, seed in itertools.product(
+        args.nodes, args.apps, args.pop, args.generations, args.seeds
+    ):
+        row = run_case(args.preset, num_nodes, num_apps, pop_size, generations, seed,
+                       args.community_generations, not args.no_memory)
+        results.append(row)
+        print(f"nodes={num_nodes} apps={num_apps} pop={pop_size} gen={generations} seed={seed}: "
+              f"total {row['time_total']:.2f}s, GA {row['time_ga']:.2f}s, "
+              f"{row['evaluations_per_second']:.0f} eval/s")
+
+    json_path, csv_path = write_results(results, args.out, meta)
+    print("Hasil disimpan ke", json_path, "dan", csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,58 @@
 import networkx as nx
-import operator
+import numpy as np
+import hashlib
 import json
 import os
 import random
+import re
+import tempfile
+
+import my_time
+
+# Naikkan jika format file cache skenario berubah
+SCENARIO_CACHE_VERSION = 2
+# Atribut preset yang menentukan isi skenario (bagian dari scenario_key), selain my_deadlines
+SCENARIO_PARAM_PREFIXES = ("FUNC_", "CLOUD_", "TOTAL_", "PERCENTAGE_", "CENTRALITY_")
+
+# Cache fungsi hasil kompilasi string FUNC_*, key = source string
+# (preset yang diubah setelah load_configuration otomatis dikompilasi ulang)
+_compiled_functions = {}
+
+_RE_RANDINT = re.compile(r"^\(?\s*random\.randint\(\s*(-?\d+)\s*,\s*(-?\d+)\s*\)\s*\)?$")
+_RE_RANDOM = re.compile(r"^\(?\s*random\.random\(\)\s*(?:([*/])\s*(\d+(?:\.\d*)?))?\s*\)?$")
+_RE_CONSTANT = re.compile(r"^\(?\s*(-?\d+(?:\.\d*)?)\s*\)?$")
+
+
+def compile_function(expr):
+    # String distribusi -> callable tanpa argumen; parsing hanya sekali per string
+    fn = _compiled_functions.get(expr)
+    if fn is None:
+        fn = eval("lambda: " + expr, {"random": random, "nx": nx})
+        _compiled_functions[expr] = fn
+    return fn
+
+
+def parse_distribution(expr):
+    # Spec deklaratif untuk distribusi sederhana, None jika tidak dikenali
+    # ("randint", low, high) | ("random", scale) | ("constant", value)
+    m = _RE_RANDINT.match(expr)
+    if m:
+        return ("randint", int(m.group(1)), int(m.group(2)))
+    m = _RE_RANDOM.match(expr)
+    if m:
+        op, value = m.group(1), m.group(2)
+        if op is None:
+            return ("random", 1.0)
+        return ("random", float(value) if op == "*" else 1.0 / float(value))
+    m = _RE_CONSTANT.match(expr)
+    if m:
+        value = m.group(1)
+        return ("constant", float(value) if "." in value else int(value))
+    return None
 
 
 class ExperimentConfiguration:
-    def __init__(self, _config):
+    def __init__(self, _config, seed=None):
         self.TOTAL_APP_NUMBER = 1
         self.CLOUD_CAPACITY = 9999999999999999
         self.CLOUD_SPEED = 9999
@@ -27,8 +73,39 @@ class ExperimentConfiguration:
         self.FUNC_APP_DEADLINE = "(random.random()*4)"
         self.FUNC_USER_REQ_RAT = "random.random()"
         self.TOTAL_FOG_NUMBER = 100
+        # Pemilihan gateway: "exact" | "approx" (k-pivot) | "degree"
+        self.CENTRALITY_MODE = "exact"
+        self.CENTRALITY_SAMPLES = 100
 
         self.config = _config
+        # seed: generate_scenario() deterministik dan bisa di-cache
+        self.seed = seed
+        self.preset_name = None
+        # Generator NumPy untuk draw vektor (None = semua draw lewat modul random, urutan lama)
+        self.np_rng = None
+
+    def use_vector_rng(self, seed=None):
+        # Aktifkan draw vektor dari numpy Generator ber-seed untuk distribusi yang dikenali
+        self.np_rng = np.random.default_rng(seed)
+
+    def draw(self, name):
+        # Satu nilai dari distribusi FUNC_* (misal "FUNC_NODE_SPEED")
+        return compile_function(getattr(self, name))()
+
+    def draw_vector(self, name, size):
+        # size nilai sekaligus; fallback ke fungsi terkompilasi jika np_rng tidak aktif
+        # atau distribusinya tidak bisa dinyatakan secara deklaratif
+        expr = getattr(self, name)
+        spec = parse_distribution(expr) if self.np_rng is not None else None
+        if spec is None:
+            fn = compile_function(expr)
+            return [fn() for _ in range(size)]
+        kind = spec[0]
+        if kind == "randint":
+            return self.np_rng.integers(spec[1], spec[2] + 1, size=size).tolist()
+        if kind == "random":
+            return (self.np_rng.random(size) * spec[1]).tolist()
+        return [spec[1]] * size
 
     def user_generation(self):
         # USER GENERATION
@@ -40,8 +117,9 @@ class ExperimentConfiguration:
 
         for i in range(0, self.TOTAL_APP_NUMBER):
             user_request_list = set()
-            prob_of_requested = eval(self.FUNC_REQUEST_PROB)
+            prob_of_requested = self.draw("FUNC_REQUEST_PROB")
             at_least_one_allocated = False
+            user_req_rat = compile_function(self.FUNC_USER_REQ_RAT)
 
             for j in self.gateway_devices:
                 if random.random() < prob_of_requested:
@@ -49,7 +127,7 @@ class ExperimentConfiguration:
                     my_one_user["app"] = str(i)
                     my_one_user["message"] = "M.USER.APP." + str(i)
                     my_one_user["id_resource"] = j
-                    my_one_user["lambda"] = eval(self.FUNC_USER_REQ_RAT)
+                    my_one_user["lambda"] = user_req_rat()
                     user_request_list.add(j)
                     self.my_users.append(my_one_user)
                     at_least_one_allocated = True
@@ -60,21 +138,25 @@ class ExperimentConfiguration:
                 my_one_user["app"] = str(i)
                 my_one_user["message"] = "M.USER.APP." + str(i)
                 my_one_user["id_resource"] = j
-                my_one_user["lambda"] = eval(self.FUNC_USER_REQ_RAT)
+                my_one_user["lambda"] = user_req_rat()
                 user_request_list.add(j)
                 self.my_users.append(my_one_user)
 
             self.app_requests.append(user_request_list)
 
         user_json["sources"] = self.my_users
+        self.user_json = user_json
+        self.write_user_definition()
+
+        print("my_users:", self.my_users)
+        print("app_requests:", self.app_requests)
+
+    def write_user_definition(self):
         if not os.path.exists(self.config.data_folder):
             os.makedirs(self.config.data_folder)
         file = open(self.config.data_folder + "/usersDefinition.json", "w")
-        file.write(json.dumps(user_json))
+        file.write(json.dumps(self.user_json))
         file.close()
-        
-        print("my_users:", self.my_users)
-        print("app_requests:", self.app_requests)
 
     def app_generation(self):
         # APPLICATION GENERATION
@@ -91,10 +173,15 @@ class ExperimentConfiguration:
 
         app_json = list()
         self.service_resources = {}
+        # Pesan masuk tiap service (instruksi dan ukuran), dipakai tabel latency GA
+        self.service_instructions = {}
+        self.service_message_bytes = {}
+        service_instr = compile_function(self.FUNC_SERVICE_INSTR)
+        service_message_size = compile_function(self.FUNC_SERVICE_MESSAGE_SIZE)
 
         for i in range(0, self.TOTAL_APP_NUMBER):
             my_app = {}
-            APP = eval(self.FUNC_APP_GENERATION)
+            APP = self.draw("FUNC_APP_GENERATION")
 
             my_labels = {}
 
@@ -128,8 +215,8 @@ class ExperimentConfiguration:
 
             self.number_of_services = self.number_of_services + len(APP.nodes)
             self.apps.append(APP)
-            for j in APP.nodes:
-                self.service_resources[j] = eval(self.FUNC_SERVICE_RESOURCES)
+            for j, res in zip(APP.nodes, self.draw_vector("FUNC_SERVICE_RESOURCES", len(APP.nodes))):
+                self.service_resources[j] = res
             self.app_resources.append(self.service_resources)
 
             topologic_order = list(nx.topological_sort(APP))
@@ -167,9 +254,11 @@ class ExperimentConfiguration:
                     my_edge["name"] = "M.USER.APP." + str(i)
                     my_edge["s"] = "None"
                     my_edge["d"] = str(i) + "_" + str(n)
-                    my_edge["instructions"] = eval(self.FUNC_SERVICE_INSTR)
+                    my_edge["instructions"] = service_instr()
                     total_MIPS = total_MIPS + my_edge["instructions"]
-                    my_edge["bytes"] = eval(self.FUNC_SERVICE_MESSAGE_SIZE)
+                    my_edge["bytes"] = service_message_size()
+                    self.service_instructions[n] = my_edge["instructions"]
+                    self.service_message_bytes[n] = my_edge["bytes"]
                     my_app["message"].append(my_edge)
                     self.app_source_messages.append(my_edge)
                     if self.config.verbose_log:
@@ -193,9 +282,11 @@ class ExperimentConfiguration:
                 my_edge["name"] = str(i) + "_(" + str(n[0]) + "-" + str(n[1]) + ")"
                 my_edge["s"] = str(i) + "_" + str(n[0])
                 my_edge["d"] = str(i) + "_" + str(n[1])
-                my_edge["instructions"] = eval(self.FUNC_SERVICE_INSTR)
+                my_edge["instructions"] = service_instr()
                 total_MIPS = total_MIPS + my_edge["instructions"]
-                my_edge["bytes"] = eval(self.FUNC_SERVICE_MESSAGE_SIZE)
+                my_edge["bytes"] = service_message_size()
+                self.service_instructions[n[1]] = my_edge["instructions"]
+                self.service_message_bytes[n[1]] = my_edge["bytes"]
                 my_app["message"].append(my_edge)
                 dest_node = n[1]
                 for o in APP.edges:
@@ -229,77 +320,75 @@ class ExperimentConfiguration:
             self.app_total_MIPS.append(total_MIPS)
 
             app_json.append(my_app)
+        self.app_json = app_json
+        self.write_app_definition()
+
+    def write_app_definition(self):
         if not os.path.exists(self.config.data_folder):
             os.makedirs(self.config.data_folder)
         file = open(self.config.data_folder + "/appDefinition.json", "w")
-        file.write(json.dumps(app_json))
+        file.write(json.dumps(self.app_json))
         file.close()
 
     def network_generation(self):
         # NETWORK GENERATION
 
-        self.G = eval(self.FUNC_NETWORK_GENERATION)
+        self.G = self.draw("FUNC_NETWORK_GENERATION")
         # G = nx.barbell_graph(5, 1)
         if self.config.graphic_terminal:
             nx.draw(self.G)
 
-        self.devices = list()
-
         self.node_resources = {}
         self.node_free_resources = {}
         self.node_speed = {}
-        for i in self.G.nodes:
-            self.node_resources[i] = eval(self.FUNC_NODE_RESOURECES)
-            self.node_speed[i] = eval(self.FUNC_NODE_SPEED)
-
-        for e in self.G.edges:
-            self.G[e[0]][e[1]]["PR"] = eval(self.FUNC_PROPAGATION_TIME)
-            self.G[e[0]][e[1]]["BW"] = eval(self.FUNC_BANDWIDTH)
+        if self.np_rng is not None:
+            nodes = list(self.G.nodes)
+            self.node_resources = dict(zip(nodes, self.draw_vector("FUNC_NODE_RESOURECES", len(nodes))))
+            self.node_speed = dict(zip(nodes, self.draw_vector("FUNC_NODE_SPEED", len(nodes))))
+            edges = list(self.G.edges)
+            nx.set_edge_attributes(self.G, dict(zip(edges, self.draw_vector("FUNC_PROPAGATION_TIME", len(edges)))), "PR")
+            nx.set_edge_attributes(self.G, dict(zip(edges, self.draw_vector("FUNC_BANDWIDTH", len(edges)))), "BW")
+        else:
+            # Urutan draw sama dengan versi eval() per elemen
+            node_res = compile_function(self.FUNC_NODE_RESOURECES)
+            node_speed = compile_function(self.FUNC_NODE_SPEED)
+            for i in self.G.nodes:
+                self.node_resources[i] = node_res()
+                self.node_speed[i] = node_speed()
+
+            prop_time = compile_function(self.FUNC_PROPAGATION_TIME)
+            bandwidth = compile_function(self.FUNC_BANDWIDTH)
+            for e in self.G.edges:
+                self.G[e[0]][e[1]]["PR"] = prop_time()
+                self.G[e[0]][e[1]]["BW"] = bandwidth()
 
         # JSON EXPORT
         net_json = {}
 
-        for i in self.G.nodes:
-            my_node = {}
-            my_node["id"] = i
-            my_node["RAM"] = self.node_resources[i]
-            my_node["IPT"] = self.node_speed[i]
-            self.devices.append(my_node)
-
-        my_edges = list()
-        for e in self.G.edges:
-            my_link = {}
-            my_link["s"] = e[0]
-            my_link["d"] = e[1]
-            my_link["PR"] = self.G[e[0]][e[1]]["PR"]
-            my_link["BW"] = self.G[e[0]][e[1]]["BW"]
-
-            my_edges.append(my_link)
-
-        centrality_values_no_ordered = nx.betweenness_centrality(
-            self.G, weight="weight"
-        )
-        centrality_values = sorted(
-            centrality_values_no_ordered.items(),
-            key=operator.itemgetter(1),
-            reverse=True,
+        self.devices = [
+            {"id": i, "RAM": self.node_resources[i], "IPT": self.node_speed[i]}
+            for i in self.G.nodes
+        ]
+        my_edges = [
+            {"s": u, "d": v, "PR": d["PR"], "BW": d["BW"]}
+            for u, v, d in self.G.edges(data=True)
+        ]
+
+        nodes, centrality = self.compute_centrality()
+        # Disimpan untuk heuristik seeding GA (first-fit per centrality)
+        self.node_centrality = dict(zip(nodes, centrality.tolist()))
+        # Urutan menurun yang stabil = sorted(..., reverse=True) pada versi lama
+        order = np.argsort(-centrality, kind="stable")
+
+        highest_centrality = centrality[order[0]]
+        self.cloud_gateway_devices = set(
+            nodes[k] for k in np.flatnonzero(centrality == highest_centrality)
         )
 
-        self.gateway_devices = set()
-        self.cloud_gateway_devices = set()
-
-        highest_centrality = centrality_values[0][1]
-
-        for device in centrality_values:
-            if device[1] == highest_centrality:
-                self.cloud_gateway_devices.add(device[0])
-
         initial_idx = int(
             (1 - self.PERCENTAGE_GATEWAYS) * len(self.G.nodes)
         )  # End index for the X percent nodes
-
-        for id_dev in range(initial_idx, len(self.G.nodes)):
-            self.gateway_devices.add(centrality_values[id_dev][0])
+        self.gateway_devices = set(nodes[k] for k in order[initial_idx:])
 
         self.cloud_id = len(self.G.nodes)
         my_node = {}
@@ -320,13 +409,269 @@ class ExperimentConfiguration:
 
         net_json["entity"] = self.devices
         net_json["link"] = my_edges
+        self.net_json = net_json
+        self.write_network_definition()
+
+    def compute_centrality(self):
+        # Centrality untuk pemilihan gateway -> (list node, array nilai)
+        # - "exact": betweenness penuh, O(VE)
+        # - "approx": betweenness dengan k pivot (CENTRALITY_SAMPLES)
+        # - "degree": proxy derajat node, O(V + E)
+        nodes = list(self.G.nodes)
+        mode = self.CENTRALITY_MODE
+        if mode == "degree":
+            degree = dict(self.G.degree)
+            values = np.fromiter((degree[i] for i in nodes), dtype=float, count=len(nodes))
+            return nodes, values
+        if mode == "approx" and self.CENTRALITY_SAMPLES < len(nodes):
+            centrality = nx.betweenness_centrality(
+                self.G, k=self.CENTRALITY_SAMPLES, weight="weight",
+                seed=random.randrange(2 ** 32),
+            )
+        elif mode in ("exact", "approx"):
+            centrality = nx.betweenness_centrality(self.G, weight="weight")
+        else:
+            raise ValueError(f"CENTRALITY_MODE tidak dikenal: {mode}")
+        values = np.fromiter((centrality[i] for i in nodes), dtype=float, count=len(nodes))
+        return nodes, values
+
+    def write_network_definition(self):
         if not os.path.exists(self.config.data_folder):
             os.makedirs(self.config.data_folder)
         file = open(self.config.data_folder + "/networkDefinition.json", "w")
-        file.write(json.dumps(net_json))
+        file.write(json.dumps(self.net_json))
         file.close()
 
+    def export_network(self):
+        # State hasil network_generation, untuk dipakai ulang oleh konfigurasi lain
+        return {
+            "G": self.G,
+            "node_resources": self.node_resources,
+            "node_speed": self.node_speed,
+            "node_centrality": self.node_centrality,
+            "devices": self.devices,
+            "gateway_devices": self.gateway_devices,
+            "cloud_gateway_devices": self.cloud_gateway_devices,
+            "cloud_id": self.cloud_id,
+            "net_json": self.net_json,
+        }
+
+    def import_network(self, state):
+        # Kebalikan export_network: network tidak dibangkitkan ulang, hanya ditulis ke data_folder
+        self.G = state["G"].copy()
+        self.node_resources = dict(state["node_resources"])
+        self.node_free_resources = {}
+        self.node_speed = dict(state["node_speed"])
+        self.node_centrality = dict(state["node_centrality"])
+        self.devices = list(state["devices"])
+        self.gateway_devices = set(state["gateway_devices"])
+        self.cloud_gateway_devices = set(state["cloud_gateway_devices"])
+        self.cloud_id = state["cloud_id"]
+        self.net_json = state["net_json"]
+        self.write_network_definition()
+
+    def build_user_requests(self):
+        # Setiap user me-request semua service (iot_id, service_id)
+        self.user_requests = []
+        for user in getattr(self, "my_users", []):
+            iot_id = user["id_resource"]
+            for service_id in range(self.number_of_services):
+                self.user_requests.append((iot_id, service_id))
+        return self.user_requests
+
+    def scenario_key(self):
+        # Key content-addressed: preset, seed dan semua parameter generator (termasuk override)
+        params = {
+            name: value for name, value in vars(self).items()
+            if name.startswith(SCENARIO_PARAM_PREFIXES) or name == "my_deadlines"
+        }
+        payload = {
+            "version": SCENARIO_CACHE_VERSION,
+            "preset": self.preset_name,
+            "seed": self.seed,
+            "vector_rng": self.np_rng is not None,
+            "params": params,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def generate_scenario(self, overrides=None, cache_dir=None):
+        """
+        Network, aplikasi, user dan user_requests dalam satu panggilan.
+        overrides: dict atribut yang ditimpa setelah load_configuration (misal TOTAL_APP_NUMBER).
+        cache_dir: jika seed diberikan, skenario disimpan ke / di-load dari <cache_dir>/<key>.npz.
+        Dengan seed, RNG global (dan np_rng) di-seed ulang setelahnya sehingga langkah berikutnya
+        (misal build_user_requests ulang atau GA tanpa seed) sama untuk cache hit maupun miss.
+        Return path file cache (None jika cache tidak dipakai).
+        """
+        for name, value in (overrides or {}).items():
+            setattr(self, name, value)
+        instr = my_time.current()
+        path = None
+        if cache_dir is not None and self.seed is not None:
+            path = os.path.join(cache_dir, self.scenario_key() + ".npz")
+
+        if path is not None and os.path.exists(path):
+            with instr.timer("scenario_load"):
+                self.load_scenario(path)
+            instr.count("scenario_cache_hits")
+        else:
+            if self.seed is not None:
+                random.seed(self.seed)
+                if self.np_rng is not None:
+                    self.use_vector_rng(self.seed)
+            with instr.timer("network_generation"):
+                self.network_generation()
+            with instr.timer("app_generation"):
+                self.app_generation()
+            with instr.timer("user_generation"):
+                self.user_generation()
+            with instr.timer("build_user_requests"):
+                self.build_user_requests()
+            if path is not None:
+                with instr.timer("scenario_save"):
+                    self.save_scenario(path)
+                instr.count("scenario_cache_misses")
+
+        if self.seed is not None:
+            random.seed(f"{self.seed}/after-scenario")
+            if self.np_rng is not None:
+                self.use_vector_rng([self.seed, 1])
+        return path
+
+    def save_scenario(self, path):
+        # Format biner ringkas: array numerik untuk network/service, JSON hanya untuk definisi app/user
+        cache_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(cache_dir, exist_ok=True)
+        nodes = list(self.G.nodes)
+        edges = list(self.G.edges(data=True))
+        num_services = self.number_of_services
+        # Nama sementara unik per penulis: proses lain yang membangun skenario yang sama
+        # tidak menimpa file setengah jadi milik proses ini
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp.npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self._write_scenario(f, nodes, edges, num_services)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Kalah balapan dengan penulis lain: file miliknya identik dan dipakai
+            if not os.path.exists(path):
+                raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write_scenario(self, f, nodes, edges, num_services):
+        np.savez_compressed(
+            f,
+            directed=np.array(self.G.is_directed()),
+            node_ids=np.array(nodes, dtype=np.int64),
+            node_ram=np.array([self.node_resources[i] for i in nodes]),
+            node_ipt=np.array([self.node_speed[i] for i in nodes]),
+            node_centrality=np.array([self.node_centrality[i] for i in nodes], dtype=float),
+            edge_src=np.array([u for u, _, _ in edges], dtype=np.int64),
+            edge_dst=np.array([v for _, v, _ in edges], dtype=np.int64),
+            edge_pr=np.array([d["PR"] for _, _, d in edges]),
+            edge_bw=np.array([d["BW"] for _, _, d in edges]),
+            gateways=np.array(sorted(self.gateway_devices), dtype=np.int64),
+            cloud_gateways=np.array(list(self.cloud_gateway_devices), dtype=np.int64),
+            cloud_id=np.array(self.cloud_id),
+            service_ram=np.array([self.service_resources[j] for j in range(num_services)]),
+            requests=np.array(self.user_requests, dtype=np.int64).reshape(-1, 2),
+            app_json=np.frombuffer(json.dumps(self.app_json).encode(), dtype=np.uint8),
+            user_json=np.frombuffer(json.dumps(self.user_json).encode(), dtype=np.uint8),
+        )
+
+    def load_scenario(self, path):
+        # Kebalikan save_scenario; file definisi JSON ditulis ulang ke data_folder
+        with np.load(path, allow_pickle=False) as data:
+            G = nx.DiGraph() if bool(data["directed"]) else nx.Graph()
+            nodes = data["node_ids"].tolist()
+            G.add_nodes_from(nodes)
+            edge_src, edge_dst = data["edge_src"].tolist(), data["edge_dst"].tolist()
+            edge_pr, edge_bw = data["edge_pr"].tolist(), data["edge_bw"].tolist()
+            G.add_edges_from(
+                (u, v, {"PR": pr, "BW": bw}) for u, v, pr, bw in zip(edge_src, edge_dst, edge_pr, edge_bw)
+            )
+            self.G = G
+            self.node_resources = dict(zip(nodes, data["node_ram"].tolist()))
+            self.node_free_resources = {}
+            self.node_speed = dict(zip(nodes, data["node_ipt"].tolist()))
+            self.node_centrality = dict(zip(nodes, data["node_centrality"].tolist()))
+            self.gateway_devices = set(data["gateways"].tolist())
+            self.cloud_gateway_devices = set(data["cloud_gateways"].tolist())
+            self.cloud_id = int(data["cloud_id"])
+            self.service_resources = dict(enumerate(data["service_ram"].tolist()))
+            self.user_requests = [tuple(r) for r in data["requests"].tolist()]
+            self.app_json = json.loads(data["app_json"].tobytes())
+            self.user_json = json.loads(data["user_json"].tobytes())
+
+        self.devices = [
+            {"id": i, "RAM": self.node_resources[i], "IPT": self.node_speed[i]}
+            for i in nodes
+        ]
+        self.devices.append(
+            {"id": self.cloud_id, "RAM": self.CLOUD_CAPACITY, "IPT": self.CLOUD_SPEED, "type": "CLOUD"}
+        )
+        links = [
+            {"s": u, "d": v, "PR": pr, "BW": bw}
+            for u, v, pr, bw in zip(edge_src, edge_dst, edge_pr, edge_bw)
+        ]
+        links.extend(
+            {"s": gw, "d": self.cloud_id, "PR": self.CLOUD_PR, "BW": self.CLOUD_BW}
+            for gw in self.cloud_gateway_devices
+        )
+        self.net_json = {"entity": self.devices, "link": links}
+        self.write_network_definition()
+        self._load_apps(self.app_json)
+        self._load_users(self.user_json)
+
+    def _load_apps(self, app_json):
+        # State aplikasi yang dibangun app_generation, direkonstruksi dari appDefinition
+        self.apps = []
+        self.app_deadlines = {}
+        self.app_source_services = []
+        self.app_source_messages = []
+        self.app_total_MIPS = []
+        self.map_service_to_apps = []
+        self.map_service_id_to_service_name = []
+        self.service_instructions = {}
+        self.service_message_bytes = {}
+        name_to_id = {}
+        for my_app in app_json:
+            i = my_app["id"]
+            APP = nx.DiGraph()
+            for module in my_app["module"]:
+                APP.add_node(module["id"])
+                name_to_id[module["name"]] = module["id"]
+                self.map_service_to_apps.append(str(i))
+                self.map_service_id_to_service_name.append(module["name"])
+            total_MIPS = 0
+            for message in my_app["message"]:
+                dest = name_to_id[message["d"]]
+                self.service_instructions[dest] = message["instructions"]
+                self.service_message_bytes[dest] = message["bytes"]
+                total_MIPS += message["instructions"]
+                if message["s"] == "None":
+                    self.app_source_services.append(dest)
+                    self.app_source_messages.append(message)
+                else:
+                    APP.add_edge(name_to_id[message["s"]], dest)
+            self.apps.append(APP)
+            self.app_deadlines[i] = my_app["deadline"]
+            self.app_total_MIPS.append(total_MIPS)
+        self.number_of_services = len(self.map_service_to_apps)
+        self.app_resources = [self.service_resources] * len(self.apps)
+        self.write_app_definition()
+
+    def _load_users(self, user_json):
+        self.my_users = list(user_json["sources"])
+        self.app_requests = [set() for _ in range(len(self.apps))]
+        for user in self.my_users:
+            self.app_requests[int(user["app"])].add(user["id_resource"])
+        self.write_user_definition()
+
     def load_configuration(self, my_configuration):
+        self.preset_name = my_configuration
         # Configuration for the IEEE IoT journal experiment
         if my_configuration == "iotjournal":
             # CLOUD
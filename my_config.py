@@ -8,6 +8,9 @@ class MyConfig:
         self.my_configuration = "iotjournal"
         self.result_folder = "results"
         self.data_folder = "dataGA"
+        # seed skenario (None = tidak deterministik, cache skenario tidak dipakai)
+        self.seed = None
+        self.scenario_cache_folder = os.path.join(self.result_folder, "scenario_cache")
 
         # try:
         #     os.stat(self.result_folder)
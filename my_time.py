@@ -6,6 +6,13 @@ Created on Mon Oct  1 16:41:05 2018
 @author: carlos
 """
 
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
 import time
 
 
@@ -22,3 +29,161 @@ class myTime:
         if self.print_:
             print(s_ + " " + str(now_ - self.myPreviousTime_))
         self.myPreviousTime_ = now_
+
+
+class _NullTimer:
+    # Context manager kosong yang dipakai bersama saat instrumentasi mati
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("instr", "name", "start")
+
+    def __init__(self, instr, name):
+        self.instr = instr
+        self.name = name
+
+    def __enter__(self):
+        self.instr._stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        path = "/".join(self.instr._stack)
+        self.instr._stack.pop()
+        entry = self.instr.timers.get(path)
+        if entry is None:
+            self.instr.timers[path] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+        return False
+
+
+class Instrumentation:
+    """
+    Timer bertingkat (nama digabung dengan "/"), counter dan profil cProfile opsional.
+    Saat enabled=False, timer() mengembalikan context manager kosong dan count() langsung return,
+    sehingga biaya di hot path hanya satu pemanggilan method.
+    trace_path: folder tujuan export() (satu file JSON per run).
+    """
+
+    def __init__(self, enabled=False, profile=False, trace_path=None):
+        self.enabled = enabled
+        self.profile_enabled = enabled and profile
+        self.trace_path = trace_path
+        self._runs = 0
+        self.reset()
+
+    @classmethod
+    def from_env(cls):
+        # PLACEMENT_TRACE=<folder> mengaktifkan trace, PLACEMENT_PROFILE=1 menambah cProfile
+        trace_path = os.environ.get("PLACEMENT_TRACE")
+        return cls(
+            enabled=bool(trace_path),
+            profile=os.environ.get("PLACEMENT_PROFILE", "") not in ("", "0"),
+            trace_path=trace_path,
+        )
+
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+        self.profiles = {}
+        self.meta = {}
+        self._stack = []
+        self._started = time.time()
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def profile(self, name, top=30):
+        # cProfile di sekitar blok; ringkasan fungsi teratas (cumulative) masuk ke trace
+        if not self.profile_enabled:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            stats = pstats.Stats(profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(top)
+            self.profiles[name] = out.getvalue()
+
+    def trace(self):
+        return {
+            "started": self._started,
+            "meta": self.meta,
+            "timers": {
+                path: {"total_s": total, "count": count}
+                for path, (total, count) in sorted(self.timers.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "profiles": self.profiles,
+        }
+
+    def export(self, path=None):
+        """
+        Tulis trace ke JSON lalu reset, sehingga setiap run punya file sendiri.
+        path None: file baru di folder trace_path. Return path file (None jika tidak ditulis).
+        """
+        if not self.enabled:
+            return None
+        if path is None:
+            if not self.trace_path:
+                return None
+            os.makedirs(self.trace_path, exist_ok=True)
+            self._runs += 1
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started))
+            path = os.path.join(self.trace_path, f"trace_{stamp}_{os.getpid()}_{self._runs}.json")
+        with open(path, "w") as f:
+            json.dump(self.trace(), f, indent=2)
+        self.reset()
+        return path
+
+
+def instrumented(name, profile=False):
+    # Decorator method: timer (dan cProfile jika profile=True) lewat atribut self.instr
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            instr = self.instr
+            if not instr.enabled:
+                return fn(self, *args, **kwargs)
+            with instr.profile(name) if profile else _NULL_TIMER, instr.timer(name):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Instrumentasi default proses, dikonfigurasi lewat environment (mati jika PLACEMENT_TRACE kosong)
+_current = Instrumentation.from_env()
+
+
+def current():
+    return _current
+
+
+def set_current(instr):
+    # Ganti instrumentasi default; return yang lama
+    global _current
+    previous, _current = _current, instr
+    return previous
@@ -13,22 +13,18 @@ def run_my_config():
 def run_experiment_configuration():
     print("\n=== Running experiment_configuration ===")
     cnf = my_config.MyConfig()
-    ec = experiment_configuration.ExperimentConfiguration(cnf)
+    ec = experiment_configuration.ExperimentConfiguration(cnf, seed=cnf.seed)
     ec.load_configuration(cnf.my_configuration)
-    ec.network_generation()
-    ec.app_generation()
-    ec.user_generation()
+    ec.generate_scenario(cache_dir=cnf.scenario_cache_folder)
     print("ExperimentConfiguration loaded.")
 
 def run_GA_Optimization():
     print("\n=== Running GA_Optimization ===")
     cnf = my_config.MyConfig()
-    ec = experiment_configuration.ExperimentConfiguration(cnf)
+    ec = experiment_configuration.ExperimentConfiguration(cnf, seed=cnf.seed)
     ec.load_configuration(cnf.my_configuration)
-    ec.network_generation()
-    ec.app_generation()
-    ec.user_generation()
-    gaopt = GA_Optimization.GAOptimization(ec, cnf)
+    ec.generate_scenario(cache_dir=cnf.scenario_cache_folder)
+    gaopt = GA_Optimization.GAOptimization(ec, cnf, seed=ec.seed)
     gaopt.solve(verbose=False)
     print("GA_Optimization selesai.")
 
@@ -68,21 +64,13 @@ if __name__ == "__main__":
 
         cnf_ = my_config.MyConfig()
         cnf_.number_of_services = total_services  # jika dipakai di config
-        ec = experiment_configuration.ExperimentConfiguration(cnf_)
+        ec = experiment_configuration.ExperimentConfiguration(cnf_, seed=cnf_.seed)
         ec.load_configuration(cnf_.my_configuration)
-        ec.network_generation()
-        ec.app_generation()
-        ec.user_generation()
+        ec.generate_scenario(cache_dir=cnf_.scenario_cache_folder)
         ec.number_of_services = total_services
+        ec.build_user_requests()
 
-        if not hasattr(ec, "user_requests") or not ec.user_requests:
-            ec.user_requests = []
-            for user in getattr(ec, "my_users", []):
-                iot_id = user["id_resource"]
-                for service_id in range(ec.number_of_services):
-                    ec.user_requests.append((iot_id, service_id))
-
-        ga_ = GA_Optimization.GAOptimization(ec, cnf_)
+        ga_ = GA_Optimization.GAOptimization(ec, cnf_, seed=ec.seed)
         service2DevicePlacementMatrixGA = ga_.solve()
         ga_.service2DevicePlacementMatrixGA = service2DevicePlacementMatrixGA
         ga_results.append(ga_)
@@ -0,0 +1,379 @@
+# Daemon placement (asyncio) untuk orchestrator
+# - job = satu baris JSON: {"id", "preset", "seed", "overrides", "objective", "mode", "repair",
+#   "ga": {parameter GA}, "warm_start", "export"}
+# - skenario, distance/latency table dan placement terakhir disimpan hangat di memori worker
+# - job yang masuk hampir bersamaan dikumpulkan per batch; job identik hanya dihitung sekali
+# - GA dijalankan di worker proses; job dengan skenario yang sama selalu ke worker yang sama
+#   (shard = scenario_key), hasil dikirim balik sebagai JSON lines (urutan selesai)
+#
+# Contoh:
+#   python placement_daemon.py --socket /tmp/placement.sock
+#   python placement_daemon.py --jobs jobs.jsonl > results.jsonl
+#   echo '{"id": 1, "seed": 1, "overrides": {"TOTAL_APP_NUMBER": 5}}' | nc -U /tmp/placement.sock
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from experiment_configuration import ExperimentConfiguration
+from GA_Optimization import GAOptimization
+
+MODES = ("flat", "nsga2", "island", "hierarchical")
+PRESETS = ("iotjournal", "firstattempt")
+
+# Override yang boleh dikirim client: nama -> (tipe, syarat nilai). FUNC_* (string yang
+# dieksekusi lewat eval) dan atribut lain sengaja tidak diterima
+OVERRIDE_RULES = {
+    "TOTAL_APP_NUMBER": (int, lambda v: v >= 1),
+    "PERCENTAGE_GATEWAYS": (float, lambda v: 0 < v <= 1),
+    "CENTRALITY_MODE": (str, lambda v: v in ("exact", "approx", "degree")),
+    "CENTRALITY_SAMPLES": (int, lambda v: v >= 1),
+    "CLOUD_CAPACITY": (float, lambda v: v >= 0),
+    "CLOUD_SPEED": (float, lambda v: v > 0),
+    "CLOUD_BW": (float, lambda v: v > 0),
+    "CLOUD_PR": (float, lambda v: v >= 0),
+}
+
+
+class DaemonConfig:
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.verbose_log = False
+        self.graphic_terminal = False
+
+
+# State hangat milik proses worker (LRU): scenario_key -> {"ec", "tables", "last"}
+# Skenario yang dibuang tetap ada di cache_dir dan di-load ulang jika diminta lagi
+_scenarios = OrderedDict()
+
+
+def _ping():
+    return os.getpid()
+
+
+def validate_overrides(overrides):
+    if overrides is None:
+        return {}
+    if not isinstance(overrides, dict):
+        raise ValueError("overrides harus berupa object JSON")
+    for name, value in overrides.items():
+        if name not in OVERRIDE_RULES:
+            raise ValueError(f"override tidak diizinkan: {name}")
+        kind, valid = OVERRIDE_RULES[name]
+        # bool adalah subclass int; int boleh untuk parameter float
+        if isinstance(value, bool) or not isinstance(value, (int, float) if kind is float else kind):
+            raise ValueError(f"override {name} harus bertipe {kind.__name__}")
+        if not valid(value):
+            raise ValueError(f"override {name} di luar rentang: {value!r}")
+    return overrides
+
+
+def _job_configuration(job):
+    preset = job.get("preset", "iotjournal")
+    if preset not in PRESETS:
+        raise ValueError(f"preset tidak dikenal: {preset}")
+    overrides = validate_overrides(job.get("overrides"))
+    ec = ExperimentConfiguration(None, seed=job.get("seed", 1))
+    ec.load_configuration(preset)
+    for name, value in overrides.items():
+        setattr(ec, name, value)
+    if ec.TOTAL_APP_NUMBER > len(ec.my_deadlines):
+        raise ValueError(f"TOTAL_APP_NUMBER maksimal {len(ec.my_deadlines)} untuk preset {preset}")
+    return ec
+
+
+def job_scenario_key(job):
+    # Hanya preset + override, tanpa membangkitkan skenario (murah, dipakai untuk routing)
+    return _job_configuration(job).scenario_key()
+
+
+def parse_job(line):
+    try:
+        job = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"invalid JSON: {e}") from None
+    if not isinstance(job, dict):
+        raise ValueError("job harus berupa object JSON")
+    return job
+
+
+def _get_scenario(job, data_root, cache_dir, max_scenarios):
+    ec = _job_configuration(job)
+    key = ec.scenario_key()
+    entry = _scenarios.get(key)
+    if entry is not None:
+        _scenarios.move_to_end(key)
+        return key, entry, True
+    ec.config = DaemonConfig(os.path.join(data_root, key))
+    ec.generate_scenario(cache_dir=cache_dir)
+    entry = {"ec": ec, "tables": {}, "last": {}}
+    _scenarios[key] = entry
+    while len(_scenarios) > max_scenarios:
+        _scenarios.popitem(last=False)
+    return key, entry, False
+
+
+def run_job(job, data_root, cache_dir, max_scenarios=32):
+    t = time.perf_counter()
+    mode = job.get("mode", "flat")
+    objective = job.get("objective", "hops")
+    if mode not in MODES:
+        raise ValueError(f"mode tidak dikenal: {mode}")
+    # Output print GA tidak boleh bercampur dengan stream JSON lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        key, entry, scenario_warm = _get_scenario(job, data_root, cache_dir, max_scenarios)
+        ec = entry["ec"]
+        gaopt = GAOptimization(
+            ec, ec.config,
+            seed=job.get("ga_seed"),
+            objective=objective,
+            repair=job.get("repair", False),
+            distance_table=entry["tables"].get("hops"),
+            latency_table=entry["tables"].get("latency"),
+        )
+        params = dict(job.get("ga") or {})
+        result = {}
+        warm = False
+        if mode == "flat":
+            last = entry["last"].get(objective)
+            if job.get("warm_start") and last is not None:
+                params["warm_start"] = gaopt.prepare_warm_start(last)
+                warm = True
+            nodes, placement, history = gaopt.ga_service_placement(return_history=True, **params)
+            result["generations"] = history[-1]["generation"]
+            result["stop_reason"] = gaopt.stop_reason
+        elif mode == "nsga2":
+            front = gaopt.ga_nsga2_placement(**params)
+            problem = gaopt.build_problem()
+            chosen = max(front, key=lambda sol: problem.fitness(sol["placement"].nodes))
+            nodes, placement = chosen["nodes"], chosen["placement"]
+            result["front"] = [
+                {"placement": sol["nodes"], "objectives": sol["objectives"], "violation": sol["violation"]}
+                for sol in front
+            ]
+        elif mode == "island":
+            nodes, placement = gaopt.ga_island_placement(**params)
+        else:
+            nodes, placement = gaopt.ga_hierarchical_placement(**params)
+
+        entry["tables"]["hops"] = gaopt.distance_table
+        entry["tables"]["latency"] = gaopt.latency_table
+        entry["last"][objective] = placement
+        fitness = gaopt.build_problem().fitness(placement.nodes)
+        if job.get("export"):
+            result["allocation_path"] = gaopt.export_allocation(nodes)
+
+    result.update({
+        "placement": [int(n) for n in nodes],
+        "fitness": float(fitness),
+        "services_in_cloud": sum(1 for n in nodes if n == ec.cloud_id),
+        "scenario": key,
+        "scenario_warm": scenario_warm,
+        "warm_start": warm,
+        "worker": os.getpid(),
+        "compute_ms": (time.perf_counter() - t) * 1000,
+    })
+    return result
+
+
+class PlacementDaemon:
+    """
+    Antrian job placement: job dikumpulkan selama batch_window_ms (maksimal max_batch job),
+    job identik (selain "id") digabung, lalu setiap job unik dijalankan di worker.
+    Setiap worker adalah executor satu proses (shard); job diarahkan lewat scenario_key sehingga
+    skenario dibangun sekali, state hangat (tabel, placement terakhir untuk warm_start) selalu
+    tersedia, dan job untuk skenario yang sama berjalan berurutan.
+    """
+
+    def __init__(self, workers=None, batch_window_ms=5.0, max_batch=64,
+                 data_root=os.path.join("results", "daemon"), cache_dir=None, max_scenarios=32):
+        self.workers = workers or os.cpu_count() or 1
+        # Batas skenario hangat per worker (LRU)
+        self.max_scenarios = max(1, max_scenarios)
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.data_root = data_root
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(data_root, "scenario_cache")
+        self.shards = []
+        self.queue = None
+        self._batcher = None
+
+    async def start(self):
+        self.shards = [ProcessPoolExecutor(max_workers=1) for _ in range(self.workers)]
+        self.queue = asyncio.Queue()
+        # Semua worker dijalankan sekarang agar job pertama tidak membayar start-up proses
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(shard, _ping) for shard in self.shards))
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    def shard_for(self, job):
+        # scenario_key berupa hex, jadi stabil antar proses (tidak seperti hash())
+        return self.shards[int(job_scenario_key(job)[:8], 16) % len(self.shards)]
+
+    async def stop(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batcher
+        for shard in self.shards:
+            shard.shutdown()
+
+    async def submit(self, job):
+        if not isinstance(job, dict):
+            raise TypeError("job harus berupa dict")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((job, future, time.perf_counter()))
+        return await future
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = {}
+            for item in batch:
+                job = item[0]
+                key = json.dumps({k: v for k, v in job.items() if k != "id"}, sort_keys=True, default=str)
+                groups.setdefault(key, []).append(item)
+            for items in groups.values():
+                try:
+                    shard = self.shard_for(items[0][0])
+                    task = loop.run_in_executor(shard, run_job, items[0][0], self.data_root, self.cache_dir,
+                                                self.max_scenarios)
+                except Exception as e:
+                    # Misalnya override tidak valid atau worker rusak; job tetap dijawab dan batcher tetap hidup
+                    task = loop.create_future()
+                    task.set_exception(e)
+                task.add_done_callback(lambda done, items=items: self._resolve(done, items))
+
+    @staticmethod
+    def _resolve(done, items):
+        now = time.perf_counter()
+        for job, future, queued in items:
+            if future.done():
+                continue
+            response = {"id": job.get("id")}
+            if done.exception() is not None:
+                response.update({"status": "error", "error": repr(done.exception())})
+            else:
+                response.update({"status": "ok", **done.result()})
+            response["batch_size"] = len(items)
+            response["latency_ms"] = (now - queued) * 1000
+            future.set_result(response)
+
+    async def handle_stream(self, reader, writer):
+        # Satu koneksi: job per baris masuk, hasil per baris keluar begitu selesai
+        lock = asyncio.Lock()
+
+        async def respond(response):
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        async def process(line):
+            try:
+                job = parse_job(line)
+            except ValueError as e:
+                await respond({"id": None, "status": "error", "error": str(e)})
+                return
+            await respond(await self.submit(job))
+
+        tasks = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                tasks.append(asyncio.create_task(process(line)))
+        await asyncio.gather(*tasks)
+        writer.close()
+
+
+async def run_jobs_file(daemon, path):
+    # Mode batch: job dibaca per baris dari file (atau "-" untuk stdin) dan langsung diantrikan;
+    # hasil ditulis ke stdout begitu selesai, baris rusak dijawab dengan status error
+    loop = asyncio.get_running_loop()
+    source = sys.stdin if path == "-" else open(path)
+
+    async def process(line):
+        try:
+            response = await daemon.submit(parse_job(line))
+        except ValueError as e:
+            response = {"id": None, "status": "error", "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    tasks = set()
+    with source:
+        while True:
+            # readline di thread agar event loop (batcher) tetap jalan saat menunggu input
+            line = await loop.run_in_executor(None, source.readline)
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.create_task(process(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+
+
+async def main_async(args):
+    daemon = PlacementDaemon(args.workers, args.batch_window_ms, args.max_batch, args.data_root,
+                             max_scenarios=args.max_scenarios)
+    await daemon.start()
+    try:
+        if args.jobs:
+            await run_jobs_file(daemon, args.jobs)
+            return
+        if args.socket:
+            server = await asyncio.start_unix_server(daemon.handle_stream, path=args.socket)
+        else:
+            server = await asyncio.start_server(daemon.handle_stream, host="127.0.0.1", port=args.port)
+        # SIGTERM/SIGINT: server ditutup dan worker pool dimatikan dengan rapi
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stopping.set)
+        print("Placement daemon siap:", args.socket or f"127.0.0.1:{args.port}", file=sys.stderr)
+        async with server:
+            await stopping.wait()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    finally:
+        await daemon.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon GA placement dengan state hangat")
+    parser.add_argument("--socket", help="path unix socket")
+    parser.add_argument("--port", type=int, default=8765, help="port TCP lokal jika --socket tidak diberikan")
+    parser.add_argument("--jobs", help="file job JSON lines ('-' = stdin); hasil ke stdout lalu keluar")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--data-root", default=os.path.join("results", "daemon"))
+    parser.add_argument("--max-scenarios", type=int, default=32,
+                        help="jumlah skenario hangat per worker (LRU); sisanya di-load ulang dari cache")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,7 @@
 import os
 from yafs_utils import (
     load_topology, load_applications, load_placement, load_population, get_selection,
-    export_yafs_metrics_to_csv,
-    analyze_placement_usage, analyze_resource_usage, analyze_delay
+    export_yafs_metrics_to_csv, Scenario, analyze_latency
 )
 
 DATA_FOLDER = "dataGA"
@@ -27,15 +26,23 @@ def main():
     export_yafs_metrics_to_csv(DATA_FOLDER)
 
     # 4. Analisis hasil
-    analyze_placement_usage(
-        os.path.join(DATA_FOLDER, "allocDefinitionGA.json"),
-        os.path.join(DATA_FOLDER, "networkDefinition.json")
+    analysis = Scenario.load(DATA_FOLDER).analyze()
+    print("\n=== Placement Usage (Jumlah service/module per node) ===")
+    for nid, count in analysis["placement_usage"].items():
+        print(f"Node {nid}: {count} module(s)")
+    print("\n=== Resource Usage (Persentase pemakaian RAM tiap node) ===")
+    for nid, usage in analysis["resource_usage"].items():
+        print(f"Node {nid}: {usage['used']}/{usage['capacity']} MB RAM, "
+              f"{usage['modules']} module(s) ({usage['percent']:.2f}%)")
+    latency = analyze_latency(
+        os.path.join(DATA_FOLDER, "dataGA.csv"),
+        os.path.join(DATA_FOLDER, "appDefinition.json")
     )
-    analyze_resource_usage(
-        os.path.join(DATA_FOLDER, "allocDefinitionGA.json"),
-        os.path.join(DATA_FOLDER, "networkDefinition.json")
-    )
-    analyze_delay(os.path.join(DATA_FOLDER, "dataGA.csv"))
+    print("\n=== Delay/Latensi per aplikasi ===")
+    for app, stats in latency["per_app"].items():
+        miss = latency["deadline_miss"].get(app, {}).get("rate", 0.0)
+        print(f"App {app}: mean {stats['mean']:.2f}, p95 {stats['p95']:.2f}, p99 {stats['p99']:.2f}, "
+              f"max {stats['max']:.2f}, deadline miss {miss * 100:.2f}%")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
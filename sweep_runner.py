@@ -0,0 +1,142 @@
+# Sweep paralel skenario placement (pengganti loop serial di placementMain)
+# - skenario = preset x seed x jumlah aplikasi
+# - network dibangkitkan sekali per (preset, seed) dan dipakai ulang semua variasi jumlah aplikasi
+# - setiap skenario dijalankan di ProcessPoolExecutor dengan folder output sendiri
+# - hasil digabung menjadi satu tabel (CSV + JSON)
+#
+# Contoh:
+#   python sweep_runner.py --presets iotjournal --apps 1-20 --seeds 1,2,3 --workers 32
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import my_config
+from experiment_configuration import ExperimentConfiguration
+from GA_Optimization import GAOptimization
+
+
+def make_config(data_folder):
+    cnf = my_config.MyConfig()
+    cnf.graphic_terminal = False
+    cnf.data_folder = data_folder
+    return cnf
+
+
+def generate_network(preset, seed, out_dir):
+    random.seed(seed)
+    cnf = make_config(os.path.join(out_dir, preset, f"seed_{seed}", "network"))
+    ec = ExperimentConfiguration(cnf)
+    ec.load_configuration(preset)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ec.network_generation()
+    return ec.export_network()
+
+
+def run_scenario(preset, seed, num_apps, network, out_dir, ga_params):
+    t = time.time()
+    data_folder = os.path.join(out_dir, preset, f"seed_{seed}", f"apps_{num_apps}")
+    cnf = make_config(data_folder)
+    ec = ExperimentConfiguration(cnf)
+    ec.load_configuration(preset)
+    ec.TOTAL_APP_NUMBER = num_apps
+    os.makedirs(data_folder, exist_ok=True)
+    # Seed turunan per skenario, tidak bergantung pada urutan eksekusi worker
+    random.seed(seed * 100003 + num_apps)
+    with open(os.path.join(data_folder, "log.txt"), "w") as log, contextlib.redirect_stdout(log):
+        ec.import_network(network)
+        ec.app_generation()
+        ec.user_generation()
+        ec.build_user_requests()
+        gaopt = GAOptimization(ec, cnf, seed=seed)
+        t_ga = time.time()
+        placement = gaopt.solve(**ga_params)
+        t_ga = time.time() - t_ga
+
+    in_cloud = sum(1 for nid in placement.node_list() if nid == ec.cloud_id)
+    return {
+        "preset": preset,
+        "seed": seed,
+        "apps": num_apps,
+        "services": ec.number_of_services,
+        "requests": len(ec.user_requests),
+        "services_in_cloud": in_cloud,
+        "services_in_fog": ec.number_of_services - in_cloud,
+        "best_fitness": gaopt.historyGA[-1]["best"] if gaopt.historyGA else None,
+        "generations_run": gaopt.historyGA[-1]["generation"] if gaopt.historyGA else None,
+        "avg_resource_usage": sum(gaopt.nodeResUseGA) / len(gaopt.nodeResUseGA),
+        "time_ga": t_ga,
+        "time_total": time.time() - t,
+        "data_folder": data_folder,
+    }
+
+
+def run_sweep(presets, seeds, app_counts, out_dir, workers=None, ga_params=None):
+    ga_params = ga_params or {}
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for preset, seed in itertools.product(presets, seeds):
+            network = generate_network(preset, seed, out_dir)
+            for num_apps in app_counts:
+                futures.append(pool.submit(run_scenario, preset, seed, num_apps, network, out_dir, ga_params))
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"{row['preset']} seed={row['seed']} apps={row['apps']}: "
+                  f"fitness {row['best_fitness']}, {row['time_total']:.2f}s")
+    rows.sort(key=lambda row: (row["preset"], row["seed"], row["apps"]))
+    return rows
+
+
+def write_table(rows, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    csv_path = os.path.join(out_dir, "sweep_results.csv")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    json_path = os.path.join(out_dir, "sweep_results.json")
+    with open(json_path, "w") as f:
+        json.dump(rows, f, indent=2)
+    return csv_path, json_path
+
+
+def int_range_list(text):
+    # "1-5,8" -> [1, 2, 3, 4, 5, 8]
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            values.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            values.append(int(part))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep paralel skenario GA placement")
+    parser.add_argument("--presets", default="iotjournal")
+    parser.add_argument("--apps", type=int_range_list, default=list(range(1, 21)))
+    parser.add_argument("--seeds", type=int_range_list, default=[1])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--pop", type=int, default=30)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--out", default=os.path.join("results", "sweep"))
+    args = parser.parse_args()
+
+    ga_params = {"pop_size": args.pop, "generations": args.generations, "mutation_rate": args.mutation_rate}
+    rows = run_sweep(args.presets.split(","), args.seeds, args.apps, args.out, args.workers, ga_params)
+    csv_path, json_path = write_table(rows, args.out)
+    print("Hasil sweep disimpan ke", csv_path, "dan", json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import os
 import json
 import csv
+import zipfile
+import numpy as np
 from yafs.core import Sim
 from yafs.application import Application
 from yafs.placement import JSONPlacement
@@ -41,70 +43,369 @@ def load_population(json_path):
 def get_selection():
     return First_ShortestPath()
 
-def export_yafs_metrics_to_csv(data_folder="dataGA"):
+EVENT_FIELDS = [
+    "id", "type", "app", "module", "message", "DES.src", "DES.dst",
+    "TOPO.src", "TOPO.dst", "module.src", "service",
+    "time_in", "time_out", "time_emit", "time_reception"
+]
+EVENT_TIME_FIELDS = ["time_in", "time_out", "time_emit", "time_reception"]
+
+
+def iter_yafs_events(events_path, read_size=1 << 20):
+    """
+    Membaca events_log.json secara bertahap, baik berupa JSON array maupun JSON lines,
+    sehingga memori tidak bergantung pada ukuran file.
+    """
+    decoder = json.JSONDecoder()
+    with open(events_path) as f:
+        buf = f.read(read_size)
+        pos = len(buf) - len(buf.lstrip())
+        if not buf[pos:pos + 1] == "[":
+            # JSON lines
+            rest = buf[pos:]
+            while True:
+                lines = rest.split("\n")
+                rest = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+                chunk = f.read(read_size)
+                if not chunk:
+                    break
+                rest += chunk
+            if rest.strip():
+                yield json.loads(rest)
+            return
+
+        pos += 1
+        eof = False
+        while True:
+            # Lewati whitespace dan koma antar elemen
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos >= len(buf):
+                    raise ValueError("buffer habis")
+                event, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise ValueError(f"{events_path}: JSON array tidak lengkap")
+                chunk = f.read(read_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield event
+            pos = end
+
+
+def _write_npy_chunk(zf, name, array):
+    with zf.open(name + ".npy", "w", force_zip64=True) as out:
+        np.lib.format.write_array(out, array, allow_pickle=False)
+
+
+def _event_columns(rows):
+    columns = {}
+    for col, k in enumerate(EVENT_FIELDS):
+        values = [row[col] for row in rows]
+        if k == "id":
+            columns[k] = np.array(values, dtype=np.int64)
+        elif k in EVENT_TIME_FIELDS:
+            columns[k] = _to_float_array(values)
+        else:
+            columns[k] = np.array(["" if v is None else str(v) for v in values])
+    return columns
+
+
+def export_yafs_metrics_to_csv(data_folder="dataGA", chunk_size=10000, columnar=None):
+    """
+    Ekspor events_log.json ke dataGA.csv secara streaming dan per chunk.
+    columnar: None, "npz" (dataGA_events.npz, satu array per kolom per chunk) atau
+    "parquet" (dataGA_events.parquet, butuh pyarrow).
+    """
     events_path = os.path.join(data_folder, "events_log.json")
     csv_path = os.path.join(data_folder, "dataGA.csv")
     if not os.path.exists(events_path):
         print(f"[export_yafs_metrics_to_csv] File {events_path} tidak ditemukan.")
         return
-    with open(events_path) as f:
-        events = json.load(f)
-    fieldnames = [
-        "id", "type", "app", "module", "message", "DES.src", "DES.dst",
-        "TOPO.src", "TOPO.dst", "module.src", "service",
-        "time_in", "time_out", "time_emit", "time_reception"
-    ]
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for i, event in enumerate(events):
-            row = {k: event.get(k, "") for k in fieldnames}
-            row["id"] = i
-            writer.writerow(row)
-
-def analyze_placement_usage(alloc_path, topo_path):
-    with open(alloc_path) as f:
-        alloc = json.load(f)
-    with open(topo_path) as f:
-        topo = json.load(f)
-    node_count = {str(n["id"]): 0 for n in topo["entity"]}
-    for item in alloc["initialAllocation"]:
-        node_id = str(item["id_resource"])
-        node_count[node_id] = node_count.get(node_id, 0) + 1
-    print("\n=== Placement Usage (Jumlah service/module per node) ===")
-    for nid, count in node_count.items():
-        print(f"Node {nid}: {count} module(s)")
-
-def analyze_resource_usage(alloc_path, topo_path):
-    with open(alloc_path) as f:
-        alloc = json.load(f)
-    with open(topo_path) as f:
-        topo = json.load(f)
-    node_resource = {str(n["id"]): n.get("RAM", 1) for n in topo["entity"]}
-    node_usage = {str(n["id"]): 0 for n in topo["entity"]}
-    for item in alloc["initialAllocation"]:
-        node_id = str(item["id_resource"])
-        node_usage[node_id] = node_usage.get(node_id, 0) + 1
-    print("\n=== Resource Usage (Persentase pemakaian RAM tiap node) ===")
-    for nid in node_resource:
-        usage = node_usage[nid]
-        total = node_resource[nid]
-        percent = (usage / total) * 100 if total else 0
-        print(f"Node {nid}: {usage}/{total} module(s) ({percent:.2f}%)")
+    if columnar not in (None, "npz", "parquet"):
+        raise ValueError(f"Unknown columnar format: {columnar}")
 
-def analyze_delay(csv_path):
-    delays = []
-    with open(csv_path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                t_in = float(row["time_in"])
-                t_out = float(row["time_out"])
-                delays.append(t_out - t_in)
-            except:
+    zf = parquet_writer = None
+    if columnar == "npz":
+        zf = zipfile.ZipFile(os.path.join(data_folder, "dataGA_events.npz"), "w", zipfile.ZIP_STORED,
+                             allowZip64=True)
+    elif columnar == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([
+            (k, pa.int64() if k == "id" else pa.float64() if k in EVENT_TIME_FIELDS else pa.string())
+            for k in EVENT_FIELDS
+        ])
+        parquet_writer = pq.ParquetWriter(os.path.join(data_folder, "dataGA_events.parquet"), schema)
+
+    def flush(rows, chunk_id):
+        writer.writerows(rows)
+        if zf is not None:
+            for k, values in _event_columns(rows).items():
+                _write_npy_chunk(zf, f"{k}.{chunk_id:06d}", values)
+        elif parquet_writer is not None:
+            parquet_writer.write_table(pa.Table.from_pydict(_event_columns(rows), schema=schema))
+
+    try:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EVENT_FIELDS)
+            rows = []
+            chunk_id = 0
+            fields = EVENT_FIELDS[1:]
+            for i, event in enumerate(iter_yafs_events(events_path)):
+                rows.append([i] + [event.get(k, "") for k in fields])
+                if len(rows) >= chunk_size:
+                    flush(rows, chunk_id)
+                    rows = []
+                    chunk_id += 1
+            if rows:
+                flush(rows, chunk_id)
+    finally:
+        if zf is not None:
+            zf.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+
+def load_yafs_event_columns(npz_path):
+    # Menggabungkan chunk dataGA_events.npz menjadi satu array per kolom
+    chunks = {}
+    with np.load(npz_path, allow_pickle=False) as data:
+        for name in sorted(data.files):
+            column = name.rsplit(".", 1)[0]
+            chunks.setdefault(column, []).append(data[name])
+    return {k: np.concatenate(v) for k, v in chunks.items()}
+
+class Scenario:
+    """
+    Satu skenario yang sudah di-parse: networkDefinition.json, appDefinition.json dan
+    allocDefinitionGA.json dibaca sekali, lalu di-index (node -> module, module -> RAM).
+    """
+
+    def __init__(self, network, apps, alloc):
+        self.network = network
+        self.apps = apps
+        self.alloc = alloc
+        self.node_ram = {str(n["id"]): n.get("RAM", 1) for n in network["entity"]}
+        self.module_ram = {}
+        for app in apps:
+            if not app or "name" not in app:
                 continue
-    if delays:
-        avg_delay = sum(delays) / len(delays)
-        print(f"\n=== Delay/Latensi ===\nRata-rata delay: {avg_delay:.4f} time unit ({len(delays)} event)")
+            for module in app.get("module", []):
+                self.module_ram[(str(app["name"]), module["name"])] = module.get("RAM", 0)
+        self.node_modules = {nid: [] for nid in self.node_ram}
+        for item in alloc["initialAllocation"]:
+            self.node_modules.setdefault(str(item["id_resource"]), []).append(
+                (str(item["app"]), item["module_name"])
+            )
+
+    @classmethod
+    def load(cls, data_folder, alloc_file="allocDefinitionGA.json",
+             network_file="networkDefinition.json", app_file="appDefinition.json"):
+        loaded = []
+        for name in (network_file, app_file, alloc_file):
+            with open(os.path.join(data_folder, name)) as f:
+                loaded.append(json.load(f))
+        return cls(*loaded)
+
+    def placement_usage(self):
+        # {node: jumlah module}
+        return {nid: len(modules) for nid, modules in self.node_modules.items()}
+
+    def resource_usage(self):
+        # {node: RAM terpakai, kapasitas, persentase, jumlah module}
+        usage = {}
+        for nid, modules in self.node_modules.items():
+            used = sum(self.module_ram.get(module, 0) for module in modules)
+            total = self.node_ram.get(nid, 0)
+            usage[nid] = {
+                "used": used,
+                "capacity": total,
+                "percent": (used / total) * 100 if total else 0,
+                "modules": len(modules),
+            }
+        return usage
+
+    def analyze(self):
+        return {
+            "placement_usage": self.placement_usage(),
+            "resource_usage": self.resource_usage(),
+        }
+
+
+def _scenario_from_paths(alloc_path, topo_path, app_path=None):
+    if app_path is None:
+        app_path = os.path.join(os.path.dirname(alloc_path), "appDefinition.json")
+    data_folder = os.path.dirname(alloc_path)
+    return Scenario.load(
+        data_folder,
+        alloc_file=os.path.relpath(alloc_path, data_folder),
+        network_file=os.path.relpath(topo_path, data_folder),
+        app_file=os.path.relpath(app_path, data_folder),
+    )
+
+
+def analyze_placement_usage(scenario, topo_path=None):
+    # scenario: Scenario, atau (alloc_path, topo_path) seperti sebelumnya
+    if not isinstance(scenario, Scenario):
+        scenario = _scenario_from_paths(scenario, topo_path)
+    return scenario.placement_usage()
+
+
+def analyze_resource_usage(scenario, topo_path=None, app_path=None):
+    # scenario: Scenario, atau (alloc_path, topo_path[, app_path]) seperti sebelumnya
+    if not isinstance(scenario, Scenario):
+        scenario = _scenario_from_paths(scenario, topo_path, app_path)
+    return scenario.resource_usage()
+
+
+def load_event_columns(path):
+    """
+    Memuat kolom event sekali sebagai array bertipe: dari dataGA_events.npz, .parquet
+    (butuh pyarrow) atau dataGA.csv. Kolom waktu float (NaN jika kosong/tidak valid).
+    """
+    if path.endswith(".npz"):
+        return load_yafs_event_columns(path)
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        return {k: table.column(k).to_numpy(zero_copy_only=False) for k in table.column_names}
+
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        values = {k: [] for k in header}
+        appenders = [values[k].append for k in header]
+        for row in reader:
+            for append, v in zip(appenders, row):
+                append(v)
+    columns = {}
+    for k, v in values.items():
+        if k in EVENT_TIME_FIELDS:
+            columns[k] = _to_float_array(v)
+        else:
+            columns[k] = np.array(v)
+    return columns
+
+
+def _to_float_array(values):
+    # Nilai kosong atau tidak valid menjadi NaN
+    out = []
+    for v in values:
+        try:
+            out.append(float(v))
+        except (TypeError, ValueError):
+            out.append(np.nan)
+    return np.array(out, dtype=float)
+
+
+def _group_latency_stats(keys, values):
+    # Statistik per grup sekaligus: urutkan (grup, nilai), lalu ambil index persentil per grup
+    if len(values) == 0:
+        return {}
+    names, inverse = np.unique(keys, return_inverse=True)
+    order = np.lexsort((values, inverse))
+    sorted_values = values[order]
+    counts = np.bincount(inverse, minlength=len(names))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sums = np.bincount(inverse, weights=values, minlength=len(names))
+
+    def percentile(q):
+        pos = starts + q * (counts - 1)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+    p50, p95, p99 = percentile(0.50), percentile(0.95), percentile(0.99)
+    maxima = sorted_values[starts + counts - 1]
+    return {
+        str(name): {
+            "count": int(counts[i]),
+            "mean": float(sums[i] / counts[i]),
+            "p50": float(p50[i]),
+            "p95": float(p95[i]),
+            "p99": float(p99[i]),
+            "max": float(maxima[i]),
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def load_app_deadlines(app_def_path):
+    with open(app_def_path) as f:
+        app_defs = json.load(f)
+    return {str(app["name"]): float(app["deadline"]) for app in app_defs if app and "deadline" in app}
+
+
+def analyze_latency(events, app_deadlines=None, window=1000.0):
+    """
+    Analisis latensi dari kolom event (path atau dict hasil load_event_columns):
+    - latency = time_out - time_in per app, module dan node (TOPO.dst): mean, p50/p95/p99, max
+    - deadline miss rate per app: response (time_out - time_emit) > deadline appDefinition.json
+    - throughput: jumlah event selesai per jendela waktu window
+    app_deadlines: dict {app: deadline} atau path appDefinition.json.
+    """
+    columns = load_event_columns(events) if isinstance(events, str) else events
+    time_in, time_out = columns["time_in"], columns["time_out"]
+    valid = np.isfinite(time_in) & np.isfinite(time_out)
+    latency = (time_out - time_in)[valid]
+    result = {
+        "overall": _group_latency_stats(np.zeros(len(latency), dtype=np.int8), latency).get("0", {}),
+        "per_app": _group_latency_stats(columns["app"][valid], latency),
+        "per_module": _group_latency_stats(columns["module"][valid], latency),
+        "per_node": _group_latency_stats(columns["TOPO.dst"][valid], latency),
+    }
+
+    if isinstance(app_deadlines, str):
+        app_deadlines = load_app_deadlines(app_deadlines)
+    result["deadline_miss"] = {}
+    if app_deadlines:
+        done = np.isfinite(columns["time_emit"]) & np.isfinite(time_out)
+        apps = columns["app"][done]
+        response = (time_out - columns["time_emit"])[done]
+        names, inverse = np.unique(apps, return_inverse=True)
+        deadlines = np.array([app_deadlines.get(str(name), np.inf) for name in names])
+        missed = np.bincount(inverse, weights=response > deadlines[inverse], minlength=len(names))
+        total = np.bincount(inverse, minlength=len(names))
+        result["deadline_miss"] = {
+            str(name): {
+                "deadline": float(deadlines[i]),
+                "missed": int(missed[i]),
+                "total": int(total[i]),
+                "rate": float(missed[i] / total[i]),
+            }
+            for i, name in enumerate(names)
+            if str(name) in app_deadlines
+        }
+
+    finished = time_out[np.isfinite(time_out)]
+    if len(finished):
+        bins = np.floor(finished / window).astype(np.int64)
+        first = bins.min()
+        counts = np.bincount(bins - first)
+        result["throughput"] = [
+            {"window_start": float((first + i) * window), "events": int(c), "rate": float(c / window)}
+            for i, c in enumerate(counts)
+        ]
+    else:
+        result["throughput"] = []
+    return result
+
+
+def analyze_delay(csv_path):
+    stats = analyze_latency(csv_path)["overall"]
+    if stats:
+        print(f"\n=== Delay/Latensi ===\nRata-rata delay: {stats['mean']:.4f} time unit ({stats['count']} event)")
+        print(f"p50: {stats['p50']:.4f}  p95: {stats['p95']:.4f}  p99: {stats['p99']:.4f}  max: {stats['max']:.4f}")
     else:
-        print("\n=== Delay/Latensi ===\nTidak ada data delay.")
\ No newline at end of file
+        print("\n=== Delay/Latensi ===\nTidak ada data delay.")
+    return stats